@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+from asreview.utils import asreview_path
+
+DEFAULT_CACHE_DIR = Path(asreview_path(), "datatools_cache")
+CACHE_FILE_NAME = "openalex.sqlite"
+# Cached responses expire after this number of days.
+DEFAULT_CACHE_TTL = 30
+# Maximum total size of the cached responses in bytes.
+DEFAULT_CACHE_MAX_SIZE = 1024**3
+# Maximum number of keys in a single SQL query.
+SQLITE_MAX_VARIABLES = 500
+
+
+class OpenAlexCache:
+    """Persistent cache for responses of the OpenAlex API.
+
+    The responses are stored in an SQLite database as JSON values. Each value has a
+    namespace, for example 'work' for works keyed by OpenAlex identifier or 'doi' for
+    OpenAlex identifiers keyed by DOI.
+
+    Parameters
+    ----------
+    cache_dir : Path
+        Directory containing the cache database. It is created if it does not exist.
+    ttl : float, optional
+        Number of days after which a cached response expires, by default
+        DEFAULT_CACHE_TTL
+    max_size : int, optional
+        Maximum total size in bytes of the cached responses. When the cache is
+        closed, the least recently used responses are removed until the cache is
+        smaller than this size. By default DEFAULT_CACHE_MAX_SIZE
+    refresh : bool, optional
+        Ignore the cached responses, but still store new responses in the cache, by
+        default False
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        ttl: float = DEFAULT_CACHE_TTL,
+        max_size: int = DEFAULT_CACHE_MAX_SIZE,
+        refresh: bool = False,
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.refresh = refresh
+
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(Path(cache_dir, CACHE_FILE_NAME))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        self._conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def get_many(self, namespace: str, keys: list[str]) -> dict:
+        """Get the cached responses for a list of keys.
+
+        Parameters
+        ----------
+        namespace : str
+            Namespace of the responses.
+        keys : list[str]
+            Keys of the responses.
+
+        Returns
+        -------
+        dict
+            Dictionary `{key: response}` containing only the keys that were found in
+            the cache and have not expired.
+        """
+        if self.refresh:
+            return {}
+
+        now = time.time()
+        min_created = now - self.ttl * 24 * 3600
+        keys = list(set(keys))
+        found = {}
+        for i in range(0, len(keys), SQLITE_MAX_VARIABLES):
+            batch = keys[i : i + SQLITE_MAX_VARIABLES]
+            rows = self._conn.execute(
+                "SELECT key, value FROM responses WHERE namespace = ? AND created >= ?"
+                f" AND key IN ({','.join('?' * len(batch))})",
+                [namespace, min_created, *batch],
+            )
+            found.update((key, json.loads(value)) for key, value in rows)
+
+        self._conn.executemany(
+            "UPDATE responses SET accessed = ? WHERE namespace = ? AND key = ?",
+            [(now, namespace, key) for key in found],
+        )
+        self._conn.commit()
+        return found
+
+    def set_many(self, namespace: str, responses: dict) -> None:
+        """Store responses in the cache.
+
+        Parameters
+        ----------
+        namespace : str
+            Namespace of the responses.
+        responses : dict
+            Dictionary `{key: response}`. The responses should be JSON serializable.
+        """
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+            [
+                (namespace, key, json.dumps(value), now, now)
+                for key, value in responses.items()
+            ],
+        )
+        self._conn.commit()
+
+    def evict(self) -> None:
+        """Remove expired responses and enforce the maximum size of the cache."""
+        min_created = time.time() - self.ttl * 24 * 3600
+        self._conn.execute("DELETE FROM responses WHERE created < ?", [min_created])
+        # Keep the most recently used responses that together fit in the cache.
+        self._conn.execute(
+            "DELETE FROM responses WHERE rowid IN ("
+            " SELECT rowid FROM ("
+            "  SELECT rowid, SUM(LENGTH(value)) OVER"
+            "   (ORDER BY accessed DESC, rowid) AS total_size"
+            "  FROM responses)"
+            " WHERE total_size > ?)",
+            [self.max_size],
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Evict old responses and close the connection to the cache database."""
+        self.evict()
+        self._conn.close()
@@ -2,9 +2,25 @@ import argparse
 import warnings
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 from asreview import ASReviewData
-from asreview.data.base import load_data
+from asreview.config import LABEL_NA
+
+from asreviewcontrib.datatools.dedup import MERGE_RULES
+from asreviewcontrib.datatools.dedup import _exact_clusters
+from asreviewcontrib.datatools.dedup import _exact_keys
+from asreviewcontrib.datatools.dedup import _is_multi_pid
+from asreviewcontrib.datatools.dedup import _key_codes
+from asreviewcontrib.datatools.dedup import _parse_precedence_arg
+from asreviewcontrib.datatools.dedup import _pid_columns
+from asreviewcontrib.datatools.dedup import _text_keys
+from asreviewcontrib.datatools.dedup import _texts
+from asreviewcontrib.datatools.dedup import merge_duplicates
+from asreviewcontrib.datatools.io import SUFFIXES_COLUMNAR
+from asreviewcontrib.datatools.io import load_datasets
+from asreviewcontrib.datatools.io import read_data
+from asreviewcontrib.datatools.io import write_data
 
 
 def _check_order_arg(order):
@@ -43,7 +59,7 @@ def _check_suffix(input_files, output_file):
     suffixes.append(Path(output_file).suffix)
 
     set_ris = {".txt", ".ris"}
-    set_tabular = {".csv", ".tab", ".tsv", ".xlsx"}
+    set_tabular = {".csv", ".tab", ".tsv", ".xlsx", *SUFFIXES_COLUMNAR}
     set_suffixes = set(suffixes)
 
     if len(set(suffixes)) > 1:
@@ -74,25 +90,92 @@ def _append_df(list_df, as_obj, label):
         list_df.append(df_slice)
 
 
-def _concat_label(list_df, label, pid="doi"):
-    # if there are any dataframes with the given label, concatenate and drop
-    # duplicates on pid and title/abstract
-    if list_df:
-        df_all = pd.concat(list_df).reset_index(drop=True)
-        df_all["included"] = label
-        n_total = len(df_all)
+def _label_texts(as_all, texts, dict_lists, dict_labels):
+    # the texts of the records as if the files with the same label were combined
+    # on their own: if none of these files has titles or abstracts, the records
+    # are compared on the other column only
+    labels = as_all.df["included"].to_numpy()
+    for column, other in [("title", "abstract"), ("abstract", "title")]:
+        name = as_all.column_spec.get(column)
+        other_name = as_all.column_spec.get(other)
+        if name is None or other_name is None:
+            continue
+        for letter, list_df in dict_lists.items():
+            if list_df and not any(name in df.columns for df in list_df):
+                texts = texts.mask(
+                    labels == dict_labels[letter],
+                    pd.Series(as_all.df[other_name].to_numpy()),
+                )
+    return texts
+
+
+def _merge_label_duplicates(df_all, clusters, precedence=None):
+    # merge the records of every cluster of duplicates with the same label into
+    # the first record of the cluster
+    records = np.flatnonzero(clusters != np.arange(len(clusters)))
+    records = np.union1d(records, clusters[records])
+    df_clusters = pd.DataFrame({"record": records, "cluster": clusters[records]})
+    return merge_duplicates(df_all, df_clusters, precedence)
+
+
+def _report_conflicts(df_conflicting_dups, pid, order, resolve):
+    # map letters to corresponding term
+    dict_terms = {"r": "relevant", "i": "irrelevant", "u": "unlabeled"}
 
-        df_all = ASReviewData(df=df_all).drop_duplicates(pid=pid).reset_index(drop=True)
+    as_conflicts_only = ASReviewData(df=df_conflicting_dups.reset_index(drop=True))
+    # create a dataframe with the relevant info for the user
+    df_info_conflicts = pd.DataFrame(
+        {
+            **{
+                column: as_conflicts_only.df[column].fillna("")
+                for column in _pid_columns(pid)
+                if column in as_conflicts_only.df.columns
+            },
+            "Title": as_conflicts_only.title,
+            "Abstract": as_conflicts_only.abstract,
+        }
+    )
 
-        n_total_dedup = n_total - len(df_all)
+    # pandas settings to print properly
+    with pd.option_context(
+        "display.max_rows",
+        None,
+        "display.max_columns",
+        len(df_info_conflicts.columns),
+        "max_colwidth",
+        40,
+        "display.width",
+        500,
+        "display.colheader_justify",
+        "left",
+    ):
         print(
-            f"Detected {n_total} records with label '{label}', from which"
-            f" {n_total_dedup} duplicate records with the same label were removed."
+            f"\nSome records have inconsistent labels in the input files. This may"
+            " be intentional because you are trying to overwrite labels in an input"
+            " file with labels from another input file. However, it may also be"
+            " because some records are unintentionally labeled inconsistently.\n\n"
+            "The following records have inconsistent labels in the input files:\n"
+            f"{df_info_conflicts}\n"
         )
-    else:
-        df_all = pd.DataFrame()
 
-    return df_all
+    if resolve == "abort":
+        raise ValueError("Abort composing because inconsistent labels were found.")
+
+    elif resolve == "keep_one":
+        warnings.warn(
+            f"Continuing, keeping one label for records with inconsistent labels,"
+            " resolving conflicts using the following hierarchy:"
+            f"\n1. {dict_terms[order[0]]}\n2. {dict_terms[order[1]]}"
+            f"\n3. {dict_terms[order[2]]}",
+            stacklevel=1,
+        )
+
+    elif resolve == "keep_all":
+        warnings.warn(
+            "Continuing, keeping all labels for duplicate records with inconsistent"
+            " labels.",
+            stacklevel=1,
+        )
 
 
 def create_composition(
@@ -103,13 +186,14 @@ def create_composition(
     pid="doi",
     order="riu",
     resolve="keep_one",
+    jobs=1,
+    merge=False,
+    precedence=None,
 ):
     # load all input files and URLs into ASReviewData objects, fill with None
     # if input was not specified
     input_files = [rel_path, irr_path, lab_path, unl_path]
-    as_rel, as_irr, as_lab, as_unl = (
-        load_data(item) if item is not None else None for item in input_files
-    )
+    as_rel, as_irr, as_lab, as_unl = load_datasets(input_files, jobs=jobs)
 
     # check whether input files are correctly labeled
     _check_label_errors(as_lab, lab_path)
@@ -135,90 +219,227 @@ def create_composition(
     if as_unl is not None:
         list_df_unl.append(as_unl.df)
 
-    # concatenate all dataframes with the same label, drop duplicates and map
-    # them in a dictionary
-    dict_dfs = {
-        "r": _concat_label(list_df_rel, 1, pid),
-        "i": _concat_label(list_df_irr, 0, pid),
-        "u": _concat_label(list_df_unl, -1, pid),
-    }
+    # map letters to corresponding label and term
+    dict_labels = {"r": 1, "i": 0, "u": -1}
+    dict_lists = {"r": list_df_rel, "i": list_df_irr, "u": list_df_unl}
+
+    # concatenate all dataframes once, in the order of the hierarchy, so that the
+    # position of a record is its priority: of every group of duplicates only the
+    # first record is kept
+    list_df = [df for letter in order for df in dict_lists[letter]]
+    df_all = pd.concat(list_df, ignore_index=True) if list_df else pd.DataFrame()
+    df_all["included"] = np.concatenate(
+        [
+            np.full(sum(len(df) for df in dict_lists[letter]), dict_labels[letter])
+            for letter in order
+        ]
+    )
+    n_total = len(df_all)
+
+    # hash the identifiers and texts of all records once; duplicates with the same
+    # label are found within the label, in the order of the input files
+    as_all = ASReviewData(df=df_all)
+    texts = _texts(as_all)
+    keys = _exact_keys(df_all, texts, pid)
+    texts_label = _label_texts(as_all, texts, dict_lists, dict_labels)
+    if texts_label is texts:
+        keys_label = keys
+    else:
+        keys_label = keys[:-1] + [(_key_codes(_text_keys(texts_label)), "text")]
+    clusters = _exact_clusters(
+        keys_label,
+        n_total,
+        groups=df_all["included"].to_numpy(),
+        transitive=_is_multi_pid(pid),
+    )
+    is_label_duplicate = clusters != np.arange(n_total)
 
-    # map letters to corresponding term
-    dict_terms = {"r": "relevant", "i": "irrelevant", "u": "unlabeled"}
+    for letter in "riu":
+        if dict_lists[letter]:
+            is_label = df_all["included"].to_numpy() == dict_labels[letter]
+            print(
+                f"Detected {is_label.sum()} records with label"
+                f" '{dict_labels[letter]}', from which"
+                f" {(is_label_duplicate & is_label).sum()} duplicate records with the"
+                " same label were removed."
+            )
 
-    # concatenate in specified order, only the first duplicate entry is kept
-    as_conflict = ASReviewData(
-        df=pd.concat(
-            [dict_dfs[order[0]], dict_dfs[order[1]], dict_dfs[order[2]]]
-        ).reset_index(drop=True)
-    )
+    if merge:
+        # merging changes the identifiers and texts of the kept records
+        df_all = _merge_label_duplicates(df_all, clusters, precedence)
+        keys = _exact_keys(df_all, _texts(ASReviewData(df=df_all)), pid)
+        is_kept = np.ones(len(df_all), dtype=bool)
+    else:
+        is_kept = ~is_label_duplicate
 
-    # check for label conflicts
-    df_conflicting_dups = as_conflict.df[as_conflict.duplicated(pid)]
+    # check for label conflicts between the kept records, the record that comes
+    # first in the hierarchy wins
+    clusters = _exact_clusters(
+        keys, len(df_all), mask=is_kept, transitive=_is_multi_pid(pid)
+    )
+    is_duplicate = clusters != np.arange(len(df_all))
+    df_conflicting_dups = df_all[is_duplicate]
     if len(df_conflicting_dups) > 0:
-        as_conflicts_only = ASReviewData(df=df_conflicting_dups.reset_index(drop=True))
-        # create a dataframe with the relevant info for the user
-        if pid in as_conflicts_only.df.columns:
-            df_info_conflicts = pd.DataFrame(
-                {
-                    pid: as_conflicts_only.df[pid].fillna(""),
-                    "Title": as_conflicts_only.title,
-                    "Abstract": as_conflicts_only.abstract,
-                }
-            )
-        else:
-            df_info_conflicts = pd.DataFrame(
-                {
-                    "Title": as_conflicts_only.title,
-                    "Abstract": as_conflicts_only.abstract,
-                }
-            )
+        _report_conflicts(df_conflicting_dups, pid, order, resolve)
+        if resolve == "keep_one":
+            is_kept &= ~is_duplicate
 
-        # pandas settings to print properly
-        with pd.option_context(
-            "display.max_rows",
-            None,
-            "display.max_columns",
-            3,
-            "max_colwidth",
-            40,
-            "display.width",
-            500,
-            "display.colheader_justify",
-            "left",
-        ):
-            print(
-                f"\nSome records have inconsistent labels in the input files. This may"
-                " be intentional because you are trying to overwrite labels in an input"
-                " file with labels from another input file. However, it may also be"
-                " because some records are unintentionally labeled inconsistently.\n\n"
-                "The following records have inconsistent labels in the input files:\n"
-                f"{df_info_conflicts}\n"
-            )
+    df_composed = df_all[is_kept].reset_index(drop=True)
+
+    # move included column to the end of dataframe
+    included = df_composed.pop("included")
+    df_composed = df_composed.assign(included=included)
 
-        if resolve == "abort":
-            raise ValueError("Abort composing because inconsistent labels were found.")
+    return df_composed
 
-        elif resolve == "keep_one":
-            warnings.warn(
-                f"Continuing, keeping one label for records with inconsistent labels,"
-                " resolving conflicts using the following hierarchy:"
-                f"\n1. {dict_terms[order[0]]}\n2. {dict_terms[order[1]]}"
-                f"\n3. {dict_terms[order[2]]}",
-                stacklevel=1,
-            )
-            df_composed = as_conflict.drop_duplicates(pid=pid).reset_index(drop=True)
 
-        elif resolve == "keep_all":
-            warnings.warn(
-                "Continuing, keeping all labels for duplicate records with inconsistent"
-                " labels.",
-                stacklevel=1,
+def update_composition(
+    base_path,
+    rel_path=None,
+    irr_path=None,
+    lab_path=None,
+    unl_path=None,
+    pid="doi",
+    order="riu",
+    resolve="keep_one",
+    jobs=1,
+    merge=False,
+    precedence=None,
+):
+    if all(item is None for item in [rel_path, irr_path, lab_path, unl_path]):
+        raise ValueError("No datasets were given to add to the composed dataset.")
+
+    # compose the new datasets on their own, with the same rules as a full
+    # composition
+    df_delta = create_composition(
+        rel_path,
+        irr_path,
+        lab_path,
+        unl_path,
+        pid=pid,
+        order=order,
+        resolve=resolve,
+        jobs=jobs,
+        merge=merge,
+        precedence=precedence,
+    )
+
+    # the existing composition, with missing labels as unlabeled
+    as_base = read_data(base_path)
+    df_base = as_base.df.reset_index(drop=True)
+    # the record numbers written by the CSV writer are read back as unnamed
+    # columns, which would be added again with every update
+    df_base = df_base.loc[
+        :, ~df_base.columns.astype(str).str.match(r"^Unnamed: \d+(\.\d+)?$")
+    ]
+    labels_base = (
+        np.asarray(as_base.labels, dtype=int)
+        if as_base.labels is not None
+        else np.full(len(df_base), LABEL_NA)
+    )
+    df_base["included"] = labels_base
+    labels_delta = df_delta["included"].to_numpy()
+    n_base = len(df_base)
+
+    # index the identifiers and texts of the existing and new records together;
+    # a new record matches the first existing record in its cluster
+    pid_columns = [
+        column
+        for column in _pid_columns(pid)
+        if column in df_base.columns or column in df_delta.columns
+    ]
+    df_pid = pd.concat(
+        [
+            df_base.reindex(columns=pid_columns),
+            df_delta.reindex(columns=pid_columns),
+        ],
+        ignore_index=True,
+    )
+    texts = pd.concat(
+        [_texts(as_base), _texts(ASReviewData(df=df_delta))], ignore_index=True
+    )
+    keys = _exact_keys(df_pid, texts, pid)
+    clusters = _exact_clusters(
+        keys, n_base + len(df_delta), transitive=_is_multi_pid(pid)
+    )
+    matches = clusters[n_base:]
+    is_matched = matches < n_base
+
+    # a new record is a duplicate of the first existing record in its cluster
+    # with the same label, and conflicts with the cluster if there is none
+    label_keys_base = clusters[:n_base] * 3 + labels_base + 1
+    targets = (
+        pd.Series(np.arange(n_base))
+        .groupby(label_keys_base)
+        .first()
+        .reindex(matches * 3 + labels_delta + 1)
+    )
+    is_duplicate = is_matched & targets.notna().to_numpy()
+    is_conflict = is_matched & ~is_duplicate
+
+    if merge:
+        # fill missing fields of the existing records with the values of new
+        # records with the same label
+        records = np.flatnonzero(is_duplicate)
+        records_targets = targets.iloc[records].to_numpy(dtype=int)
+        base_records = np.unique(records_targets)
+        df_merged = merge_duplicates(
+            pd.concat(
+                [df_base.iloc[base_records], df_delta.iloc[records]],
+                ignore_index=True,
+            ),
+            pd.DataFrame(
+                {
+                    "record": np.arange(len(base_records) + len(records)),
+                    "cluster": np.concatenate(
+                        [
+                            np.arange(len(base_records)),
+                            np.searchsorted(base_records, records_targets),
+                        ]
+                    ),
+                }
+            ),
+            precedence,
+        )
+        df_base = df_base.reindex(
+            columns=df_base.columns.union(df_merged.columns, sort=False)
+        )
+        df_base.loc[base_records, df_merged.columns] = df_merged.set_axis(base_records)
+
+    is_added = ~is_matched
+    n_updated = 0
+    if is_conflict.any():
+        _report_conflicts(df_delta[is_conflict], pid, order, resolve)
+        if resolve == "keep_one":
+            # rank of the labels in the hierarchy, indexed by label + 1
+            dict_labels = {"r": 1, "i": 0, "u": -1}
+            labels_order = np.array([dict_labels[letter] for letter in order])
+            rank = np.argsort(labels_order + 1)
+
+            # the existing records in the cluster of a conflicting new record
+            # take its label if it comes first in the hierarchy
+            best_rank = (
+                pd.Series(rank[labels_delta[is_conflict] + 1])
+                .groupby(matches[is_conflict])
+                .min()
+            )
+            rank_base = rank[labels_base + 1]
+            is_updated = np.isin(clusters[:n_base], best_rank.index)
+            rank_base[is_updated] = np.minimum(
+                rank_base[is_updated],
+                best_rank.loc[clusters[:n_base][is_updated]].to_numpy(),
             )
-            df_composed = as_conflict.df
+            labels_composed = labels_order[rank_base]
+            n_updated = (labels_composed != labels_base).sum()
+            df_base["included"] = labels_composed
+        elif resolve == "keep_all":
+            is_added |= is_conflict
 
-    else:
-        df_composed = as_conflict.df
+    df_composed = pd.concat([df_base, df_delta[is_added]], ignore_index=True)
+    print(
+        f"Updated the labels of {n_updated} records and added {is_added.sum()}"
+        f" records to the composed dataset {base_path}."
+    )
 
     # move included column to the end of dataframe
     included = df_composed.pop("included")
@@ -228,24 +449,48 @@ def create_composition(
 
 
 def _output_composition(final_df, output_file):
-    # prepare collected labels to pass to the output file
-    labels = [[index, row["included"]] for index, row in final_df.iterrows()]
-    as_composed = ASReviewData(df=final_df)
+    # write the collected labels to the label column of the output file, with
+    # missing values for unlabeled records
+    as_composed = ASReviewData(df=final_df.copy())
+    col_label = as_composed.column_spec["included"]
+    as_composed.df[col_label] = (
+        final_df["included"].astype("Int64").mask(final_df["included"] == LABEL_NA)
+    )
 
-    as_composed.to_file(output_file, labels=labels)
+    write_data(as_composed, output_file)
 
     print(f"Finished, exported composed dataset to {output_file}.")
 
 
 def compose(
-    output_file, rel, irr, lab, unl, pid="doi", order="riu", resolve="keep_one"
+    output_file,
+    rel,
+    irr,
+    lab,
+    unl,
+    pid="doi",
+    order="riu",
+    resolve="keep_one",
+    jobs=1,
+    merge=False,
+    precedence=None,
+    base=None,
 ):
     # check whether all input has the same file extension
-    _check_suffix([rel, irr, lab, unl], output_file)
-
-    df_composition = create_composition(
-        rel, irr, lab, unl, pid=pid, order=order, resolve=resolve
-    )
+    _check_suffix([base, rel, irr, lab, unl], output_file)
+
+    kwargs = {
+        "pid": pid,
+        "order": order,
+        "resolve": resolve,
+        "jobs": jobs,
+        "merge": merge,
+        "precedence": precedence,
+    }
+    if base is not None:
+        df_composition = update_composition(base, rel, irr, lab, unl, **kwargs)
+    else:
+        df_composition = create_composition(rel, irr, lab, unl, **kwargs)
     _output_composition(df_composition, output_file)
 
 
@@ -260,12 +505,22 @@ def _parse_arguments_compose():
     )
     parser.add_argument("--labeled", "-l", type=str, help="A labeled dataset.")
     parser.add_argument("--unlabeled", "-u", type=str, help="An unlabeled dataset.")
+    parser.add_argument(
+        "--base",
+        type=str,
+        default=None,
+        help=(
+            "An existing composed dataset to add the records and labels of the other"
+            " datasets to. Only the records that are duplicates of new records are"
+            " updated."
+        ),
+    )
     parser.add_argument(
         "--hierarchy",
         dest="hierarchy",
         type=_check_order_arg,
         default="riu",
-        help="Hierarchy of labels in case of duplicates." "Default: riu.",
+        help="Hierarchy of labels in case of duplicates.Default: riu.",
     )
     parser.add_argument(
         "--conflict_resolve",
@@ -273,12 +528,42 @@ def _parse_arguments_compose():
         dest="conflict_resolve",
         type=_check_resolve_arg,
         default="keep_one",
-        help="Method for dealing with " "conflicting labels.",
+        help="Method for dealing with conflicting labels.",
     )
     parser.add_argument(
         "--pid",
         type=str,
         default="doi",
-        help="Persistent identifier used for deduplication. " "Default: doi.",
+        nargs="+",
+        help=(
+            "Persistent identifier used for deduplication. Several identifiers can"
+            " be given, records with the same value for any of them are duplicates."
+            " Default: doi."
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of processes parsing the input files in parallel. Default: 1.",
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help=(
+            "Fill missing fields of records with the values of their duplicates with"
+            " the same label instead of dropping the duplicates with their values."
+        ),
+    )
+    parser.add_argument(
+        "--precedence",
+        type=_parse_precedence_arg,
+        nargs="+",
+        default=None,
+        help=(
+            "Rules for merging columns, as COLUMN=RULE with RULE one of"
+            f" {MERGE_RULES}, for example abstract=longest. Default: first."
+        ),
     )
     return parser
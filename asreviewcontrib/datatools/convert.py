@@ -1,13 +1,14 @@
 import argparse
 
-from asreview.data import ASReviewData
+from asreviewcontrib.datatools.io import read_data
+from asreviewcontrib.datatools.io import write_data
 
 
 def convert(input_path, output_path):
     # read data in ASReview data object
-    asdata = ASReviewData.from_file(input_path)
+    asdata = read_data(input_path)
 
-    asdata.to_file(output_path)
+    write_data(asdata, output_path)
 
 
 def _parse_arguments_convert():
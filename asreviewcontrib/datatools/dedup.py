@@ -0,0 +1,805 @@
+import argparse
+import string
+
+import numpy as np
+import pandas as pd
+from asreview import ASReviewData
+from pandas.api.types import is_object_dtype
+from pandas.api.types import is_string_dtype
+
+from asreviewcontrib.datatools.io import read_data
+from asreviewcontrib.datatools.io import write_data
+
+# Number of hash functions in the MinHash signature of a text.
+NUM_PERM = 64
+# Number of records of which the MinHash signatures are computed at once.
+MINHASH_BATCH_SIZE = 10000
+# Punctuation is replaced by spaces before splitting texts into words.
+PUNCTUATION_TABLE = str.maketrans(dict.fromkeys(string.punctuation, " "))
+# Rules for choosing the value of a column when merging duplicates.
+MERGE_RULES = ["first", "last", "longest"]
+# Number of candidate pairs of which the similarity is estimated at once.
+SCORE_BATCH_SIZE = 100000
+# Minimum probability that two texts with a similarity equal to the threshold are
+# compared.
+LSH_RECALL = 0.95
+# Number of following records in a bucket that every record is compared with.
+LSH_WINDOW = 100
+
+
+def _pid_columns(pid):
+    return [pid] if isinstance(pid, str) else list(pid)
+
+
+def _is_multi_pid(pid):
+    # With several persistent identifiers, records linked by any of them are one
+    # cluster, also through later records.
+    return len(_pid_columns(pid)) > 1
+
+
+def _pid_keys(df, pid):
+    # Same normalization of the persistent identifier as in ASReviewData.duplicated.
+    s_pid = df[pid].reset_index(drop=True)
+    if is_string_dtype(s_pid) or is_object_dtype(s_pid):
+        s_pid = s_pid.str.strip().replace("", None)
+        if pid == "doi":
+            s_pid = s_pid.str.lower().str.replace(
+                r"^https?://(www\.)?doi\.org/", "", regex=True
+            )
+    return s_pid
+
+
+def _texts(asdata):
+    # Same as ASReviewData.texts, without a loop over the records.
+    if asdata.title is None:
+        return pd.Series(asdata.abstract)
+    if asdata.abstract is None:
+        return pd.Series(asdata.title)
+    return pd.Series(asdata.title) + " " + pd.Series(asdata.abstract)
+
+
+def _text_keys(texts):
+    # Same normalization of the texts as in ASReviewData.duplicated.
+    return (
+        texts.str.replace("[^A-Za-z0-9]", "", regex=True)
+        .str.lower()
+        .str.strip()
+        .replace("", None)
+    )
+
+
+def _key_codes(keys):
+    # Hash the keys once into integer codes, -1 for records without a key.
+    return pd.factorize(keys.reset_index(drop=True).to_numpy())[0]
+
+
+def _exact_keys(df, texts, pid="doi"):
+    """Integer codes of the identifiers and texts on which duplicates are exact.
+
+    Returns
+    -------
+    list[tuple[numpy.ndarray, str]]
+        Codes of every present persistent identifier column and of the texts, with
+        the name of the column or "text".
+    """
+    keys = [
+        (_key_codes(_pid_keys(df, column)), column)
+        for column in _pid_columns(pid)
+        if column in df.columns
+    ]
+    keys.append((_key_codes(_text_keys(texts)), "text"))
+    return keys
+
+
+def _code_links(codes, groups=None, mask=None):
+    """Link every record to the first record with the same code.
+
+    Parameters
+    ----------
+    codes : numpy.ndarray
+        Integer code of the key of every record, in the order of the records.
+        Records with a negative code are not linked.
+    groups : numpy.ndarray, optional
+        Integer group of every record. If given, only records in the same group are
+        linked.
+    mask : numpy.ndarray, optional
+        Boolean mask of the records that can be linked. By default all records.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        Positions of the linked records and of the first record with the same code.
+    """
+    has_code = codes >= 0
+    if mask is not None:
+        has_code &= mask
+    records = np.flatnonzero(has_code)
+    codes = codes[records].astype(np.int64)
+    if groups is not None:
+        groups = pd.factorize(groups[records])[0]
+        codes = codes * (groups.max(initial=0) + 1) + groups
+    _, first, inverse = np.unique(codes, return_index=True, return_inverse=True)
+    first = records[first][inverse]
+    is_link = records != first
+    return records[is_link], first[is_link]
+
+
+def _shingles(texts):
+    # The shingles of a text are its pairs of consecutive words, hashed to 64 bit
+    # integers. A text of a single word is represented by that word.
+    words = (
+        texts.reset_index(drop=True)
+        .str.lower()
+        .str.translate(PUNCTUATION_TABLE)
+        .str.split()
+    )
+    words = words.explode()
+    words = words[words.notna()]
+    records = words.index.to_numpy()
+    hashes = pd.util.hash_array(words.to_numpy(dtype=object))
+
+    is_pair = records[1:] == records[:-1]
+    first_hashes, second_hashes = hashes[:-1][is_pair], hashes[1:][is_pair]
+    pair_hashes = (first_hashes * np.uint64(1099511628211)) ^ second_hashes
+    is_single = np.bincount(records, minlength=len(texts))[records] == 1
+
+    shingle_records = np.concatenate([records[:-1][is_pair], records[is_single]])
+    shingle_hashes = np.concatenate([pair_hashes, hashes[is_single]])
+    order = np.argsort(shingle_records, kind="stable")
+    return shingle_records[order], shingle_hashes[order]
+
+
+def minhash_signatures(texts, num_perm=NUM_PERM, seed=0):
+    """Compute the MinHash signatures of texts.
+
+    The fraction of equal values in the signatures of two texts estimates the
+    Jaccard similarity of the sets of word pairs in the texts.
+
+    Parameters
+    ----------
+    texts : pandas.Series
+        The texts.
+    num_perm : int, optional
+        Number of hash functions, by default NUM_PERM
+    seed : int, optional
+        Seed of the hash functions, by default 0
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        Array of shape (len(texts), num_perm) with the signatures and a boolean array
+        that is False for the texts without words, which have no signature.
+    """
+    rng = np.random.default_rng(seed)
+    # Multiply-shift hash functions: the upper 32 bits of a * x + b (mod 2**64).
+    a = 2 * rng.integers(0, 2**63, size=num_perm, dtype=np.uint64) + np.uint64(1)
+    b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+    signatures = np.full((len(texts), num_perm), np.iinfo(np.uint32).max, np.uint32)
+    has_signature = np.zeros(len(texts), dtype=bool)
+    for start in range(0, len(texts), MINHASH_BATCH_SIZE):
+        records, hashes = _shingles(texts.iloc[start : start + MINHASH_BATCH_SIZE])
+        if len(records) == 0:
+            continue
+        batch_records, starts = np.unique(records, return_index=True)
+        batch_records += start
+        has_signature[batch_records] = True
+        for i in range(num_perm):
+            values = ((a[i] * hashes + b[i]) >> np.uint64(32)).astype(np.uint32)
+            signatures[batch_records, i] = np.minimum.reduceat(values, starts)
+    return signatures, has_signature
+
+
+def _lsh_recall(similarity, bands, rows):
+    # Probability that all rows in at least one of the bands of the signatures of
+    # two texts with this similarity are equal.
+    return 1 - (1 - similarity**rows) ** bands
+
+
+def _lsh_params(threshold, num_perm, recall=LSH_RECALL):
+    # Split the signatures in bands of rows. Two texts are a candidate pair if all
+    # rows in one of the bands are equal. The most rows per band, which give the
+    # fewest candidate pairs, are used for which a pair with a similarity equal to
+    # the threshold is a candidate with a probability of at least `recall`.
+    candidates = [(num_perm // rows, rows) for rows in range(1, num_perm + 1)]
+    for bands, rows in reversed(candidates):
+        if _lsh_recall(threshold, bands, rows) >= recall:
+            return bands, rows
+    return candidates[0]
+
+
+def _bucket_links(codes, window=LSH_WINDOW):
+    """Link the records in the same bucket to each other.
+
+    Every record is linked to the `window` records before it in its bucket, which
+    are all records in the bucket unless the bucket is large.
+
+    Parameters
+    ----------
+    codes : numpy.ndarray
+        Integer code of the bucket of every record. Records with a negative code
+        are not linked.
+    window : int, optional
+        Maximum number of records a record is linked to, by default LSH_WINDOW
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        Positions of the linked records and of the earlier records they are linked
+        to.
+    """
+    records = np.flatnonzero(codes >= 0)
+    records = records[np.argsort(codes[records], kind="stable")]
+    codes = codes[records]
+
+    links = []
+    for offset in range(1, window + 1):
+        is_link = codes[offset:] == codes[:-offset]
+        # the records of a bucket are consecutive, there are no links at larger
+        # offsets if there are none at this one
+        if not is_link.any():
+            break
+        links.append((records[offset:][is_link], records[:-offset][is_link]))
+    if not links:
+        return np.array([], dtype=int), np.array([], dtype=int)
+    return np.concatenate([u for u, _ in links]), np.concatenate([v for _, v in links])
+
+
+def _similar_text_links(texts, threshold, num_perm=NUM_PERM):
+    """Link records with similar texts using MinHash and locality sensitive hashing.
+
+    Records with the same signature are linked to the first of them. Of the other
+    records, only the pairs that end up in the same bucket for one of the bands of
+    their signatures are compared, so that the running time is close to linear in
+    the number of records.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+        Positions of the linked records, positions of the records they are linked
+        to and the estimated Jaccard similarity of their texts.
+    """
+    signatures, has_signature = minhash_signatures(texts, num_perm=num_perm)
+    bands, rows = _lsh_params(threshold, num_perm)
+
+    def signature_codes(columns):
+        keys = pd.Series(
+            pd.util.hash_pandas_object(
+                pd.DataFrame(signatures[:, columns]), index=False
+            ).to_numpy()
+        )
+        return _key_codes(keys.where(has_signature))
+
+    # records with the same signature are not compared with each other, so that
+    # large buckets of copies of a text do not give many candidate pairs
+    same_records, same_first = _code_links(signature_codes(slice(None)))
+    is_unique = has_signature.copy()
+    is_unique[same_records] = False
+
+    links = []
+    for band in range(bands):
+        codes = signature_codes(slice(band * rows, (band + 1) * rows))
+        records, first = _bucket_links(np.where(is_unique, codes, -1))
+        links.append(records * len(texts) + first)
+    links = np.unique(np.concatenate(links)) if links else np.array([], dtype=int)
+    records, first = links // len(texts), links % len(texts)
+
+    scores = np.concatenate(
+        [
+            np.mean(
+                signatures[records[i : i + SCORE_BATCH_SIZE]]
+                == signatures[first[i : i + SCORE_BATCH_SIZE]],
+                axis=1,
+            )
+            for i in range(0, len(records), SCORE_BATCH_SIZE)
+        ]
+        or [np.array([])]
+    )
+    is_similar = scores >= threshold
+    return (
+        np.concatenate([same_records, records[is_similar]]),
+        np.concatenate([same_first, first[is_similar]]),
+        np.concatenate([np.ones(len(same_records)), scores[is_similar]]),
+    )
+
+
+def _connected_components(n, u, v):
+    """Label the connected components of a graph by their smallest node.
+
+    Parameters
+    ----------
+    n : int
+        Number of nodes.
+    u, v : numpy.ndarray
+        The edges of the graph.
+
+    Returns
+    -------
+    numpy.ndarray
+        For every node, the smallest node in its connected component.
+    """
+    labels = np.arange(n)
+    while True:
+        # Both ends of every edge take the smallest label of the two, after which
+        # every node jumps to the label of its label.
+        new_labels = labels.copy()
+        smallest = np.minimum(labels[u], labels[v])
+        np.minimum.at(new_labels, u, smallest)
+        np.minimum.at(new_labels, v, smallest)
+        new_labels = new_labels[new_labels]
+        if np.array_equal(new_labels, labels):
+            return labels
+        labels = new_labels
+
+
+def _exact_links(keys, groups=None, mask=None, transitive=False):
+    """Link every duplicate record to an earlier record with the same key.
+
+    Like in ASReviewData.duplicated, a record is a duplicate if an earlier record
+    has the same value for one of the identifiers or the same text. Every duplicate
+    is linked once, to the first record with the same value for the first of the
+    keys it shares with an earlier record. Records are not linked through later
+    records, so the links form trees of which the roots are the kept records.
+
+    If `transitive`, every record is linked to the first record with the same value
+    for every key, so that records linked through later records are one cluster.
+
+    Parameters
+    ----------
+    keys : list[tuple[numpy.ndarray, str]]
+        Codes of the keys as returned by `_exact_keys`.
+    groups : numpy.ndarray, optional
+        Group of every record. If given, only records in the same group are
+        duplicates of each other.
+    mask : numpy.ndarray, optional
+        Boolean mask of the records that are compared. The other records are not
+        duplicates of any record.
+    transitive : bool, optional
+        Link the records for all keys, by default False
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+        Positions of the duplicates, positions of the records they are linked to and
+        the position of the key of the link in `keys`.
+    """
+    links = [_code_links(codes, groups=groups, mask=mask) for codes, _ in keys]
+    u = np.concatenate([u for u, _ in links])
+    v = np.concatenate([v for _, v in links])
+    key = np.repeat(np.arange(len(links)), [len(u) for u, _ in links])
+    if transitive:
+        return u, v, key
+    # the links are in the order of the keys, the first link of a record is kept
+    _, first = np.unique(u, return_index=True)
+    return u[first], v[first], key[first]
+
+
+def _exact_clusters(keys, n, groups=None, mask=None, transitive=False):
+    """Label the clusters of records with the same identifier or text.
+
+    The duplicates are the same as in ASReviewData.duplicated, unless `transitive`,
+    see `_exact_links`.
+
+    Parameters
+    ----------
+    keys : list[tuple[numpy.ndarray, str]]
+        Codes of the keys as returned by `_exact_keys`.
+    n : int
+        Number of records.
+    groups : numpy.ndarray, optional
+        Group of every record. If given, only records in the same group are
+        duplicates of each other.
+    mask : numpy.ndarray, optional
+        Boolean mask of the records that are compared. The other records are not
+        duplicates of any record.
+    transitive : bool, optional
+        Also cluster records linked through later records, by default False
+
+    Returns
+    -------
+    numpy.ndarray
+        For every record, the first record in its cluster.
+    """
+    u, v, _ = _exact_links(keys, groups=groups, mask=mask, transitive=transitive)
+    return _connected_components(n, u, v)
+
+
+def find_duplicates(asdata, pid="doi", threshold=None):
+    """Find clusters of duplicate records.
+
+    With a single persistent identifier, a record is a duplicate if an earlier
+    record has the same identifier or the same title and abstract (ignoring case
+    and non-alphanumeric characters), like in ASReviewData.duplicated. It is linked
+    to that earlier record. With several persistent identifiers, records are linked
+    to all records with the same value for any of them or the same title and
+    abstract. If a `threshold` is given, records with a similar title and abstract
+    are linked as well. Records that are linked directly or through other records
+    form a cluster. The first record of every cluster is kept, the others are
+    duplicates.
+
+    Parameters
+    ----------
+    asdata : ASReviewData
+        The dataset.
+    pid : str | list[str], optional
+        Persistent identifier or list of persistent identifiers used for
+        deduplication, by default "doi". Identifiers that are not a column of the
+        dataset are ignored.
+    threshold : float | None, optional
+        Minimal estimated Jaccard similarity of the word pairs in the titles and
+        abstracts of near-duplicates, between 0 and 1. By default None, meaning that
+        only exact duplicates are found.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row for every record in a cluster of more than one record, with the
+        columns `record` (position of the record in the dataset), `cluster`
+        (position of the kept record of the cluster), `score` and `reason` (the
+        similarity and the reason of the strongest link of the record: the name of
+        the persistent identifier, "text" or "similar text").
+    """
+    n = len(asdata)
+    texts = _texts(asdata)
+    # The links of the identifiers, the texts and the similar texts form one graph,
+    # so that records linked by any of them end up in the same cluster.
+    keys = _exact_keys(asdata.df, texts, pid)
+    u, v, key = _exact_links(keys, transitive=_is_multi_pid(pid))
+    reasons = np.array([reason for _, reason in keys], dtype=object)
+    links = [(u, v, 1.0, reasons[key])]
+    if threshold is not None:
+        u, v, scores = _similar_text_links(texts, threshold)
+        links.append((u, v, scores, "similar text"))
+
+    df_links = pd.concat(
+        [
+            pd.DataFrame({"u": u, "v": v, "score": score, "reason": reason})
+            for u, v, score, reason in links
+        ],
+        ignore_index=True,
+    )
+    labels = _connected_components(
+        n, df_links["u"].to_numpy(), df_links["v"].to_numpy()
+    )
+
+    # The strongest link of every record, exact links before similar ones.
+    df_records = (
+        pd.concat(
+            [
+                df_links.rename(columns={"u": "record"}),
+                df_links.rename(columns={"v": "record"}),
+            ],
+            ignore_index=True,
+        )
+        .sort_values(["record", "score"], ascending=[True, False], kind="stable")
+        .drop_duplicates("record")
+    )
+    df_records["cluster"] = labels[df_records["record"].to_numpy()]
+    return df_records[["record", "cluster", "score", "reason"]].reset_index(drop=True)
+
+
+def duplicated(df_clusters, n):
+    """Mark the duplicate records, all records in a cluster but the first.
+
+    Parameters
+    ----------
+    df_clusters : pandas.DataFrame
+        Clusters of duplicates as returned by `find_duplicates`.
+    n : int
+        Number of records in the dataset.
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean array that is True for the duplicate records.
+    """
+    is_duplicate = np.zeros(n, dtype=bool)
+    is_duplicate[df_clusters["record"].to_numpy()] = (
+        df_clusters["record"] != df_clusters["cluster"]
+    ).to_numpy()
+    return is_duplicate
+
+
+def duplicate_report(df_clusters):
+    """Summarize clusters of duplicates in one row per cluster.
+
+    Parameters
+    ----------
+    df_clusters : pandas.DataFrame
+        Clusters of duplicates as returned by `find_duplicates`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row for every cluster, with the columns `kept` (position of the kept
+        record), `dropped` (positions of the duplicates, separated by ';'),
+        `n_dropped`, `reason` (the reasons of the matches in the cluster, separated
+        by ';') and `min_score` (the lowest similarity of a match in the cluster).
+    """
+    df_clusters = df_clusters.sort_values(["cluster", "record"])
+    clusters = df_clusters.groupby("cluster")
+    df_dropped = df_clusters[df_clusters["record"] != df_clusters["cluster"]]
+    dropped = df_dropped["record"].astype(str).groupby(df_dropped["cluster"])
+
+    return pd.DataFrame(
+        {
+            "kept": clusters["cluster"].first(),
+            "dropped": dropped.agg(";".join),
+            "n_dropped": dropped.size(),
+            "reason": clusters["reason"].unique().str.join(";"),
+            "min_score": clusters["score"].min(),
+        }
+    ).reset_index(drop=True)
+
+
+def merge_duplicates(df, df_clusters, precedence=None):
+    """Merge every cluster of duplicates into its kept record.
+
+    Missing and empty fields of the kept record are filled with the values of the
+    other records in the cluster, so that for example an abstract or DOI that is
+    only present in a duplicate is not lost.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The records.
+    df_clusters : pandas.DataFrame
+        Clusters of duplicates as returned by `find_duplicates`.
+    precedence : dict, optional
+        Dictionary {column: rule} with the rule deciding which value of a cluster
+        is used for a column: "first" (the value of the first record that has one,
+        the default), "last" (the value of the last record that has one) or
+        "longest" (the longest value, for example the full abstract instead of a
+        truncated one), which is only for text and list columns. By default None,
+        meaning "first" for all columns.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The merged records, in the order of the kept records, with a new index.
+    """
+    precedence = dict(precedence) if precedence is not None else {}
+    for column, rule in precedence.items():
+        if rule not in MERGE_RULES:
+            raise ValueError(
+                f"Merge rule '{rule}' for column '{column}' not found, should be one"
+                f" of the following: {MERGE_RULES}"
+            )
+        if column not in df.columns:
+            raise ValueError(
+                f"Column '{column}' of the merge rule '{rule}' not found in the"
+                " dataset."
+            )
+        if rule == "longest" and not (
+            is_string_dtype(df[column]) or is_object_dtype(df[column])
+        ):
+            raise ValueError(
+                f"Merge rule 'longest' is only for text columns, column '{column}'"
+                f" has type {df[column].dtype}."
+            )
+
+    df = df.reset_index(drop=True)
+    df_clusters = df_clusters.sort_values(["cluster", "record"])
+    records = df_clusters["record"].to_numpy()
+    clusters = df_clusters["cluster"].to_numpy()
+
+    # Empty strings are missing values as well, ASReview fills missing titles,
+    # abstracts, authors, keywords and notes with them.
+    df_grouped = df.iloc[records]
+    df_grouped = df_grouped.mask(df_grouped == "")
+    groups = df_grouped.groupby(clusters, sort=True)
+    df_merged = groups.first()
+    for column, rule in precedence.items():
+        if rule == "last":
+            df_merged[column] = groups[column].last()
+        elif rule == "longest":
+            lengths = df_grouped[column].str.len().fillna(-1).to_numpy()
+            order = np.lexsort((-lengths, clusters))
+            df_merged[column] = (
+                df_grouped[column].iloc[order].groupby(clusters[order]).first()
+            )
+    # Fields that are missing in the whole cluster keep the value of the kept
+    # record, for example an empty string.
+    df_merged = df_merged.fillna(df.iloc[df_merged.index])
+
+    df.loc[df_merged.index, df_merged.columns] = df_merged
+    return df[~df.index.isin(records[records != clusters])].reset_index(drop=True)
+
+
+def _remove_duplicates(asdata, df_clusters, is_duplicate, merge=False, precedence=None):
+    if merge:
+        df_dedup = merge_duplicates(asdata.df, df_clusters, precedence)
+    else:
+        df_dedup = asdata.df[~is_duplicate].reset_index(drop=True)
+    return ASReviewData(df=df_dedup)
+
+
+def deduplicate(asdata, pid="doi", threshold=None, merge=False, precedence=None):
+    """Return a dataset without the duplicate records.
+
+    Parameters
+    ----------
+    asdata : ASReviewData
+        The dataset.
+    pid : str | list[str], optional
+        Persistent identifier or list of persistent identifiers used for
+        deduplication, by default "doi"
+    threshold : float | None, optional
+        Also remove near-duplicates of which the titles and abstracts have at least
+        this similarity, between 0 and 1. By default None, meaning that only exact
+        duplicates are removed.
+    merge : bool, optional
+        Fill missing fields of the kept records with the values of their
+        duplicates, see `merge_duplicates`. By default False
+    precedence : dict, optional
+        Dictionary {column: rule} with the rules for merging the columns, see
+        `merge_duplicates`. By default None
+
+    Returns
+    -------
+    ASReviewData
+        The dataset without duplicates, with the records numbered from 0.
+    """
+    df_clusters = find_duplicates(asdata, pid=pid, threshold=threshold)
+    is_duplicate = duplicated(df_clusters, len(asdata.df))
+    return _remove_duplicates(
+        asdata, df_clusters, is_duplicate, merge=merge, precedence=precedence
+    )
+
+
+def dedup(
+    input_path,
+    output_path=None,
+    pid="doi",
+    threshold=None,
+    clusters_path=None,
+    report_path=None,
+    merge=False,
+    precedence=None,
+):
+    """Remove duplicate records from a dataset.
+
+    Parameters
+    ----------
+    input_path : str
+        Location of the input dataset.
+    output_path : str, optional
+        Location of the deduplicated dataset. By default None, meaning that the
+        duplicates are only counted.
+    pid : str | list[str], optional
+        Persistent identifier or list of persistent identifiers used for
+        deduplication, by default "doi"
+    threshold : float | None, optional
+        Also remove near-duplicates of which the titles and abstracts have at least
+        this similarity, between 0 and 1. By default None, meaning that only exact
+        duplicates are removed.
+    clusters_path : str, optional
+        Location of a CSV file to which the clusters of duplicates are written, by
+        default None
+    report_path : str, optional
+        Location of a CSV file to which a report with one row for every cluster of
+        duplicates is written, see `duplicate_report`. By default None
+    merge : bool, optional
+        Fill missing fields of the kept records with the values of their
+        duplicates, see `merge_duplicates`. By default False
+    precedence : dict, optional
+        Dictionary {column: rule} with the rules for merging the columns, see
+        `merge_duplicates`. By default None
+    """
+    # read data in ASReview data object
+    asdata = read_data(input_path)
+    initial_length = len(asdata.df)
+
+    for column in _pid_columns(pid):
+        if column not in asdata.df.columns:
+            print(
+                f"Not using {column} for deduplication because there is no such data."
+            )
+
+    df_clusters = find_duplicates(asdata, pid=pid, threshold=threshold)
+    is_duplicate = duplicated(df_clusters, initial_length)
+
+    # count duplicates
+    n_dup = int(is_duplicate.sum())
+
+    if clusters_path:
+        df_clusters = df_clusters.sort_values(["cluster", "record"])
+        df_clusters.to_csv(clusters_path, index=False)
+        print(f"Saved {df_clusters['cluster'].nunique()} clusters to {clusters_path}.")
+
+    if report_path:
+        df_report = duplicate_report(df_clusters)
+        df_report.to_csv(report_path, index=False)
+        print(f"Saved report of {len(df_report)} duplicate groups to {report_path}.")
+
+    if output_path:
+        asdata = _remove_duplicates(
+            asdata, df_clusters, is_duplicate, merge=merge, precedence=precedence
+        )
+        write_data(asdata, output_path)
+        print(f"Removed {n_dup} duplicates from dataset with {initial_length} records.")
+    else:
+        print(f"Found {n_dup} duplicates in dataset with {initial_length} records.")
+
+
+def _parse_precedence_arg(precedence):
+    column, _, rule = precedence.rpartition("=")
+    if not column or rule not in MERGE_RULES:
+        raise argparse.ArgumentTypeError(
+            f"precedence '{precedence}' should be COLUMN=RULE with RULE one of the"
+            f" following: {MERGE_RULES}"
+        )
+    return column, rule
+
+
+def _parse_arguments_dedup():
+    parser = argparse.ArgumentParser(prog="asreview data dedup")
+    parser.add_argument("input_path", type=str, help="The file path of the dataset.")
+    parser.add_argument(
+        "--output_path",
+        "-o",
+        default=None,
+        type=str,
+        help="The file path of the dataset.",
+    )
+    parser.add_argument(
+        "--pid",
+        default="doi",
+        type=str,
+        nargs="+",
+        help=(
+            "Persistent identifier used for deduplication. Several identifiers can"
+            " be given, records with the same value for any of them are duplicates."
+            " Default: doi."
+        ),
+    )
+    parser.add_argument(
+        "--threshold",
+        "-t",
+        default=None,
+        type=float,
+        help=(
+            "Also remove near-duplicates of which the titles and abstracts have at"
+            " least this similarity (between 0 and 1, for example 0.8). By default"
+            " only exact duplicates are removed."
+        ),
+    )
+    parser.add_argument(
+        "--clusters",
+        dest="clusters_path",
+        default=None,
+        type=str,
+        help=(
+            "Write the clusters of duplicate records with the similarity of the"
+            " records to this CSV file."
+        ),
+    )
+    parser.add_argument(
+        "--report",
+        dest="report_path",
+        default=None,
+        type=str,
+        help=(
+            "Write a report of the duplicates to this CSV file, with for every group"
+            " of duplicates the kept record, the dropped records and the reason."
+        ),
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help=(
+            "Fill missing fields of the kept records with the values of their"
+            " duplicates instead of dropping the duplicates with their values."
+        ),
+    )
+    parser.add_argument(
+        "--precedence",
+        type=_parse_precedence_arg,
+        nargs="+",
+        default=None,
+        help=(
+            "Rules for merging columns, as COLUMN=RULE with RULE one of"
+            f" {MERGE_RULES}, for example abstract=longest. Default: first."
+        ),
+    )
+    return parser
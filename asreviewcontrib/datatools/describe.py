@@ -1,81 +1,605 @@
 import argparse
+import glob
 import json
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
 import asreview
-from asreview.data import load_data
-from asreview.data.statistics import n_duplicates
-from asreview.data.statistics import n_irrelevant
-from asreview.data.statistics import n_missing_abstract
-from asreview.data.statistics import n_missing_title
-from asreview.data.statistics import n_records
-from asreview.data.statistics import n_relevant
-from asreview.data.statistics import n_unlabeled
+import numpy as np
+import pandas as pd
+from asreview import ASReviewData
+from pandas.api.types import is_numeric_dtype
 
 from asreviewcontrib.datatools import __version__
+from asreviewcontrib.datatools.dedup import _pid_columns
+from asreviewcontrib.datatools.dedup import _pid_keys
+from asreviewcontrib.datatools.dedup import _text_keys
+from asreviewcontrib.datatools.dedup import _texts
+from asreviewcontrib.datatools.io import iter_chunks
+from asreviewcontrib.datatools.io import read_data
 
+# Percentiles of the lengths of the titles and abstracts.
+LENGTH_PERCENTILES = [5, 25, 50, 75, 95]
+# Columns with the publication year, the first one present is used.
+YEAR_COLUMNS = ["year", "publication_year"]
+# Values that count as missing: empty text, and the empty lists of RIS records
+# that ASReview converts to text.
+EMPTY_VALUES = ["", "[]"]
+# Number of bits of the hashes that select a register of a HyperLogLog sketch, so
+# that a sketch has 2**14 registers and a relative error of about 1%.
+HLL_PRECISION = 14
 
-def describe(input_path, output_path=None):
-    # read data in ASReview data object
-    asdata = load_data(input_path)
 
+def _rate(n, n_records):
+    return round(n / n_records, 4) if n_records > 0 else None
+
+
+def _hashes(keys):
+    # 64 bit hashes of the keys that are not missing, the same in every chunk.
+    keys = keys[keys.notna()]
+    return pd.util.hash_array(keys.to_numpy(dtype=object))
+
+
+def _length_percentiles(counts):
+    """Mean and percentiles of the lengths of texts, from their histogram.
+
+    The percentiles are interpolated linearly, like `numpy.percentile`. Texts of
+    length 0 are missing and left out.
+
+    Parameters
+    ----------
+    counts : numpy.ndarray
+        Number of texts of every length, the length being the position.
+
+    Returns
+    -------
+    dict | None
+        The mean and percentiles, None if all texts are missing.
+    """
+    counts = counts[1:]
+    n = counts.sum()
+    if n == 0:
+        return None
+    lengths = np.arange(1, len(counts) + 1)
+    # the length of the texts at the given positions in the sorted texts
+    cumulative = np.cumsum(counts)
+    positions = np.array(LENGTH_PERCENTILES) / 100 * (n - 1)
+    lower = lengths[np.searchsorted(cumulative, np.floor(positions), side="right")]
+    upper = lengths[np.searchsorted(cumulative, np.ceil(positions), side="right")]
+    percentiles = lower + (upper - lower) * (positions - np.floor(positions))
+    return {
+        "mean": round(float((lengths * counts).sum() / n), 1),
+        **{
+            f"p{q}": round(float(value), 1)
+            for q, value in zip(LENGTH_PERCENTILES, percentiles)
+        },
+    }
+
+
+class _KeySet:
+    """Set of the hashes of the keys of the records seen so far.
+
+    The hashes are kept in sorted arrays, so that every key takes 8 bytes. The hashes
+    of every chunk are a new array. The last array is merged into the one before
+    it as long as that one is not more than twice as large, so that there are few
+    arrays and every hash is merged a logarithmic number of times.
+    """
+
+    def __init__(self):
+        self._runs = []
+
+    def add(self, hashes):
+        """Add hashes and return which of them were seen before.
+
+        Parameters
+        ----------
+        hashes : numpy.ndarray
+            Hashes of the keys, in the order of the records.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean mask of the hashes that were added before or that occur earlier
+            in `hashes`.
+        """
+        is_seen = pd.Series(hashes).duplicated().to_numpy()
+        for run in self._runs:
+            positions = np.searchsorted(run, hashes)
+            positions[positions == len(run)] = 0
+            is_seen |= run[positions] == hashes
+
+        new_hashes = np.sort(hashes[~is_seen])
+        if len(new_hashes) > 0:
+            self._runs.append(new_hashes)
+        while len(self._runs) > 1 and len(self._runs[-2]) <= 2 * len(self._runs[-1]):
+            # two sorted arrays are merged in linear time with timsort
+            last = self._runs.pop()
+            self._runs[-1] = np.sort(
+                np.concatenate([self._runs[-1], last]), kind="stable"
+            )
+        return is_seen
+
+
+class _HyperLogLog:
+    """HyperLogLog sketch estimating the number of distinct hashes.
+
+    The sketch keeps 2**precision registers, no matter how many hashes are added.
+    """
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self._registers = np.zeros(2**precision, dtype=np.uint8)
+
+    def add(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        n_bits = 64 - self.precision
+        registers = (hashes >> np.uint64(n_bits)).astype(np.intp)
+        # the rank is the position of the first set bit in the remaining bits
+        remainder = hashes & np.uint64(2**n_bits - 1)
+        bit_length = np.frexp(remainder.astype(np.float64))[1]
+        ranks = (n_bits - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self._registers, registers, ranks)
+
+    def count(self):
+        m = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m**2 / np.sum(2.0 ** -self._registers.astype(np.float64))
+        n_zero = np.count_nonzero(self._registers == 0)
+        # linear counting is more accurate for small numbers of hashes
+        if estimate <= 2.5 * m and n_zero > 0:
+            estimate = m * np.log(m / n_zero)
+        return float(estimate)
+
+
+class DescribeStatistics:
+    """Statistics of a dataset, updated with every chunk of records.
+
+    Only counts are kept, so the memory does not depend on the size of the
+    dataset, except for the hashes of the keys used for finding duplicates. With
+    `approximate`, the number of duplicates is estimated with HyperLogLog sketches
+    instead, which take constant memory.
+
+    Parameters
+    ----------
+    pid : str | list[str], optional
+        Persistent identifier or list of persistent identifiers used for
+        deduplication and for the coverage of the identifiers, by default "doi"
+    approximate : bool, optional
+        Estimate the number of duplicates, by default False. The estimate is the
+        largest number of records with the same identifier or the same text as an
+        earlier record, which is a lower bound if several keys are used.
+    keep_keys : bool, optional
+        Keep the hashes of the keys of every record, so that the statistics can be
+        merged into the statistics of other datasets, see `merge`. By default False
+    """
+
+    def __init__(self, pid="doi", approximate=False, keep_keys=False):
+        self.pid = _pid_columns(pid)
+        self.approximate = approximate
+        self.keep_keys = keep_keys
+        self.n_records = 0
+        self._n_relevant = self._n_irrelevant = None
+        self._n_missing = {"title": None, "abstract": None}
+        self._lengths = {
+            "title": np.zeros(0, dtype=np.int64),
+            "abstract": np.zeros(0, dtype=np.int64),
+        }
+        self._n_null = {}
+        self._years = {}
+        self._has_years = False
+        keys = [*self.pid, "text"]
+        self._n_keyed = dict.fromkeys(keys, 0)
+        if approximate:
+            self._sketches = {key: _HyperLogLog() for key in keys}
+        else:
+            self._key_sets = {key: _KeySet() for key in keys}
+        self._n_duplicates = 0
+        self._keys = []
+
+    def update(self, asdata):
+        """Add the records of a chunk to the statistics.
+
+        Parameters
+        ----------
+        asdata : ASReviewData
+            The records in the chunk.
+        """
+        df = asdata.df
+        n_records = len(df)
+
+        # Counts of the labels and missing texts. Records in chunks without the
+        # column are unlabeled or missing, like when the chunks are stacked.
+        labels = asdata.labels
+        if labels is not None:
+            self._n_relevant = (self._n_relevant or 0) + int((labels == 1).sum())
+            self._n_irrelevant = (self._n_irrelevant or 0) + int((labels == 0).sum())
+
+        for column, texts in [("title", asdata.title), ("abstract", asdata.abstract)]:
+            if texts is None:
+                if self._n_missing[column] is not None:
+                    self._n_missing[column] += n_records
+                continue
+            lengths = np.bincount(pd.Series(texts).str.len().to_numpy(dtype=np.int64))
+            if self._n_missing[column] is None:
+                self._n_missing[column] = self.n_records
+            self._n_missing[column] += int(lengths[0]) if len(lengths) > 0 else 0
+            size = max(len(lengths), len(self._lengths[column]))
+            self._lengths[column] = np.pad(
+                self._lengths[column], (0, size - len(self._lengths[column]))
+            ) + np.pad(lengths, (0, size - len(lengths)))
+
+        # Missing values per column. Records in chunks without the column have no
+        # value, also if ASReview fills the column when reading the whole file.
+        label_column = asdata.column_spec["included"]
+        for column in df.columns:
+            self._n_null.setdefault(column, self.n_records)
+            if column == label_column:
+                is_null = ~df[column].isin([0, 1])
+            else:
+                is_null = df[column].isna() | df[column].isin(EMPTY_VALUES)
+            self._n_null[column] += int(is_null.sum())
+        for column in self._n_null.keys() - set(df.columns):
+            self._n_null[column] += n_records
+
+        year_column = next((c for c in YEAR_COLUMNS if c in df.columns), None)
+        if year_column is not None:
+            self._has_years = True
+            years = df[year_column]
+            # Years are read as numbers or as text, like "2019" or "2019/01/01".
+            if is_numeric_dtype(years):
+                years = years.dropna().astype(int).astype(str)
+            else:
+                years = years.astype(str).str.extract(r"(\d{4})", expand=False)
+            for year, count in years.value_counts().items():
+                self._years[year] = self._years.get(year, 0) + int(count)
+
+        # A record is a duplicate if an earlier record has the same identifier or
+        # text, like in ASReviewData.duplicated.
+        keys = {
+            column: _pid_keys(df, column) for column in self.pid if column in df.columns
+        }
+        keys["text"] = _text_keys(_texts(asdata))
+        self._add_keys(
+            n_records,
+            {
+                key: (values.notna().to_numpy(), _hashes(values))
+                for key, values in keys.items()
+            },
+        )
+
+        self.n_records += n_records
+
+    def _add_keys(self, n_records, keys):
+        # keys is a dictionary {key: (has_key, hashes)} with a boolean mask of the
+        # records with the key and the hashes of their keys
+        if self.keep_keys:
+            self._keys.append((n_records, keys))
+        is_duplicate = np.zeros(n_records, dtype=bool)
+        for key, (has_key, hashes) in keys.items():
+            self._n_keyed[key] += len(hashes)
+            if self.approximate:
+                self._sketches[key].add(hashes)
+            else:
+                is_duplicate[has_key] |= self._key_sets[key].add(hashes)
+        self._n_duplicates += int(is_duplicate.sum())
+
+    def merge(self, other):
+        """Add the statistics of another dataset, as if it is stacked below.
+
+        Records of the other dataset with the same identifier or text as a record
+        added before are duplicates.
+
+        Parameters
+        ----------
+        other : DescribeStatistics
+            Statistics with the same persistent identifiers. Unless the number of
+            duplicates is estimated, they have to keep the keys of the records.
+        """
+        if other.pid != self.pid or other.approximate != self.approximate:
+            raise ValueError("Only statistics of the same kind can be merged.")
+        if not self.approximate and not other.keep_keys:
+            raise ValueError("Statistics without the keys cannot be merged.")
+
+        # Counts of records without a label, text or column in one of the
+        # datasets are counted as missing.
+        if other._n_relevant is not None:
+            self._n_relevant = (self._n_relevant or 0) + other._n_relevant
+            self._n_irrelevant = (self._n_irrelevant or 0) + other._n_irrelevant
+        for column in self._n_missing:
+            if self._n_missing[column] is None and other._n_missing[column] is None:
+                continue
+            self._n_missing[column] = (
+                self.n_records
+                if self._n_missing[column] is None
+                else self._n_missing[column]
+            ) + (
+                other.n_records
+                if other._n_missing[column] is None
+                else other._n_missing[column]
+            )
+            size = max(len(self._lengths[column]), len(other._lengths[column]))
+            self._lengths[column] = np.pad(
+                self._lengths[column], (0, size - len(self._lengths[column]))
+            ) + np.pad(other._lengths[column], (0, size - len(other._lengths[column])))
+        for column in [*self._n_null, *other._n_null.keys() - self._n_null.keys()]:
+            self._n_null[column] = self._n_null.get(
+                column, self.n_records
+            ) + other._n_null.get(column, other.n_records)
+        self._has_years |= other._has_years
+        for year, count in other._years.items():
+            self._years[year] = self._years.get(year, 0) + count
+
+        if self.approximate:
+            for key, sketch in self._sketches.items():
+                self._n_keyed[key] += other._n_keyed[key]
+                np.maximum(
+                    sketch._registers,
+                    other._sketches[key]._registers,
+                    out=sketch._registers,
+                )
+        else:
+            for n_records, keys in other._keys:
+                self._add_keys(n_records, keys)
+
+        self.n_records += other.n_records
+
+    @property
+    def n_duplicates(self):
+        if not self.approximate:
+            return self._n_duplicates
+        return max(
+            max(0, round(self._n_keyed[key] - sketch.count()))
+            for key, sketch in self._sketches.items()
+        )
+
+    def items(self):
+        """Return the statistics of the records added so far.
+
+        Returns
+        -------
+        list[dict]
+            Statistics with their id, title, description and value.
+        """
+        has_labels = self._n_relevant is not None
+
+        return [
+            {
+                "id": "n_records",
+                "title": "Number of records",
+                "description": "The number of records in the dataset.",
+                "value": self.n_records,
+            },
+            {
+                "id": "n_relevant",
+                "title": "Number of relevant records",
+                "description": "The number of relevant records in the dataset.",
+                "value": self._n_relevant,
+            },
+            {
+                "id": "n_irrelevant",
+                "title": "Number of irrelevant records",
+                "description": "The number of irrelevant records in the dataset.",
+                "value": self._n_irrelevant,
+            },
+            {
+                "id": "n_unlabeled",
+                "title": "Number of unlabeled records",
+                "description": "The number of unlabeled records in the dataset.",
+                "value": (
+                    self.n_records - self._n_relevant - self._n_irrelevant
+                    if has_labels
+                    else None
+                ),
+            },
+            {
+                "id": "n_missing_title",
+                "title": "Number of records with missing title",
+                "description": (
+                    "The number of records in the dataset with missing title."
+                ),
+                "value": self._n_missing["title"],
+            },
+            {
+                "id": "n_missing_abstract",
+                "title": "Number of records with missing abstract",
+                "description": (
+                    "The number of records in the dataset with missing abstract."
+                ),
+                "value": self._n_missing["abstract"],
+            },
+            {
+                "id": "n_duplicates",
+                "title": "Number of duplicate records (basic algorithm)",
+                "description": (
+                    "The number of duplicate records in the dataset based on"
+                    " similar text."
+                ),
+                "value": self.n_duplicates,
+            },
+            {
+                "id": "null_rate",
+                "title": "Fraction of missing values per column",
+                "description": (
+                    "The fraction of the records in the dataset without a value, for"
+                    " every column. Unlabeled records have no value for the label."
+                ),
+                "value": {
+                    column: _rate(n, self.n_records)
+                    for column, n in self._n_null.items()
+                },
+            },
+            {
+                "id": "year_histogram",
+                "title": "Number of records per publication year",
+                "description": (
+                    "The number of records in the dataset for every publication year."
+                ),
+                "value": (
+                    dict(sorted(self._years.items())) if self._has_years else None
+                ),
+            },
+            {
+                "id": "title_length",
+                "title": "Length of the titles",
+                "description": (
+                    "The mean and percentiles of the number of characters of the"
+                    " titles in the dataset, without missing titles."
+                ),
+                "value": (
+                    _length_percentiles(self._lengths["title"])
+                    if self._n_missing["title"] is not None
+                    else None
+                ),
+            },
+            {
+                "id": "abstract_length",
+                "title": "Length of the abstracts",
+                "description": (
+                    "The mean and percentiles of the number of characters of the"
+                    " abstracts in the dataset, without missing abstracts."
+                ),
+                "value": (
+                    _length_percentiles(self._lengths["abstract"])
+                    if self._n_missing["abstract"] is not None
+                    else None
+                ),
+            },
+            {
+                "id": "pid_coverage",
+                "title": "Coverage of the persistent identifiers",
+                "description": (
+                    "The fraction of the records in the dataset with a persistent"
+                    " identifier, for every identifier."
+                ),
+                "value": {
+                    column: _rate(self._n_keyed[column], self.n_records)
+                    for column in self.pid
+                },
+            },
+        ]
+
+
+def describe_statistics(asdata, pid="doi", approximate=False):
+    """Compute the statistics of a dataset.
+
+    All statistics are computed with vectorized operations on the columns of the
+    dataset. The counts are the same as the statistics in `asreview.data.statistics`.
+
+    Parameters
+    ----------
+    asdata : ASReviewData
+        The dataset.
+    pid : str | list[str], optional
+        Persistent identifier or list of persistent identifiers used for
+        deduplication and for the coverage of the identifiers, by default "doi"
+    approximate : bool, optional
+        Estimate the number of duplicates, see `DescribeStatistics`. By default
+        False
+
+    Returns
+    -------
+    list[dict]
+        Statistics with their id, title, description and value.
+    """
+    stats = DescribeStatistics(pid=pid, approximate=approximate)
+    stats.update(asdata)
+    return stats.items()
+
+
+def _expand_paths(input_paths):
+    # Glob patterns are expanded to the matching files, in alphabetical order.
+    paths = []
+    for item in input_paths:
+        if any(char in item for char in "*?["):
+            matches = sorted(glob.glob(item))
+            if not matches:
+                raise ValueError(f"No files match {item}")
+            paths.extend(matches)
+        else:
+            paths.append(item)
+    return paths
+
+
+def _describe_file(
+    input_path, pid="doi", chunk_size=None, approximate=False, keep_keys=False
+):
+    stats = DescribeStatistics(pid=pid, approximate=approximate, keep_keys=keep_keys)
+    if chunk_size is None:
+        # read data in ASReview data object
+        stats.update(read_data(input_path))
+    else:
+        for df in iter_chunks(input_path, chunk_size):
+            if len(df) > 0:
+                stats.update(ASReviewData(df=df))
+    return stats
+
+
+def describe_files(input_paths, pid="doi", chunk_size=None, approximate=False, jobs=1):
+    """Compute the statistics of several datasets and of all datasets together.
+
+    Parameters
+    ----------
+    input_paths : list
+        Locations of the datasets.
+    pid : str | list[str], optional
+        Persistent identifier or list of persistent identifiers, by default "doi"
+    chunk_size : int, optional
+        Read the datasets in chunks of this number of records, by default None,
+        meaning that every dataset is loaded at once.
+    approximate : bool, optional
+        Estimate the number of duplicates, see `DescribeStatistics`. By default
+        False
+    jobs : int, optional
+        Number of processes describing the datasets, by default 1
+
+    Returns
+    -------
+    tuple[list[list[dict]], list[dict]]
+        The statistics of every dataset, and of the datasets stacked in the given
+        order. The latter also counts the records with the same identifier or text
+        as a record in an earlier dataset.
+    """
+    describe_file = partial(
+        _describe_file,
+        pid=pid,
+        chunk_size=chunk_size,
+        approximate=approximate,
+        keep_keys=not approximate,
+    )
+    if jobs <= 1 or len(input_paths) <= 1:
+        file_stats = [describe_file(item) for item in input_paths]
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(input_paths))) as executor:
+            file_stats = list(executor.map(describe_file, input_paths))
+
+    total_stats = DescribeStatistics(pid=pid, approximate=approximate)
+    for stats in file_stats:
+        total_stats.merge(stats)
+    n_cross_file_duplicates = max(
+        0, total_stats.n_duplicates - sum(stats.n_duplicates for stats in file_stats)
+    )
+    total_items = [
+        *total_stats.items(),
+        {
+            "id": "n_cross_file_duplicates",
+            "title": "Number of duplicate records between datasets",
+            "description": (
+                "The number of records with the same identifier or text as a record"
+                " in an earlier dataset, and not in their own dataset."
+            ),
+            "value": n_cross_file_duplicates,
+        },
+    ]
+    return [stats.items() for stats in file_stats], total_items
+
+
+def _output_statistics(data, output_path=None):
     # based on https://google.github.io/styleguide/jsoncstyleguide.xml
     stats = {
         "asreviewVersion": asreview.__version__,
         "apiVersion": __version__,
-        "data": {
-            "items": [
-                {
-                    "id": "n_records",
-                    "title": "Number of records",
-                    "description": "The number of records in the dataset.",
-                    "value": n_records(asdata),
-                },
-                {
-                    "id": "n_relevant",
-                    "title": "Number of relevant records",
-                    "description": "The number of relevant records in the dataset.",
-                    "value": n_relevant(asdata),
-                },
-                {
-                    "id": "n_irrelevant",
-                    "title": "Number of irrelevant records",
-                    "description": "The number of irrelevant records in the dataset.",
-                    "value": n_irrelevant(asdata),
-                },
-                {
-                    "id": "n_unlabeled",
-                    "title": "Number of unlabeled records",
-                    "description": "The number of unlabeled records in the dataset.",
-                    "value": n_unlabeled(asdata),
-                },
-                {
-                    "id": "n_missing_title",
-                    "title": "Number of records with missing title",
-                    "description": (
-                        "The number of records in the dataset with missing title."
-                    ),
-                    "value": n_missing_title(asdata)[0],
-                },
-                {
-                    "id": "n_missing_abstract",
-                    "title": "Number of records with missing abstract",
-                    "description": (
-                        "The number of records in the dataset with missing abstract."
-                    ),
-                    "value": n_missing_abstract(asdata)[0],
-                },
-                {
-                    "id": "n_duplicates",
-                    "title": "Number of duplicate records (basic algorithm)",
-                    "description": (
-                        "The number of duplicate records in the dataset based on"
-                        " similar text."
-                    ),
-                    "value": n_duplicates(asdata),
-                },
-            ]
-        },
-    }  # noqa
+        "data": data,
+    }
 
     if output_path:
         with open(output_path, "w") as f:
@@ -84,9 +608,55 @@ def describe(input_path, output_path=None):
     print(json.dumps(stats, indent=2))
 
 
+def describe(
+    input_path,
+    output_path=None,
+    pid="doi",
+    chunk_size=None,
+    approximate=False,
+    jobs=1,
+):
+    input_paths = _expand_paths(
+        [input_path] if isinstance(input_path, str) else input_path
+    )
+
+    if len(input_paths) == 1:
+        data = {
+            "items": _describe_file(
+                input_paths[0], pid=pid, chunk_size=chunk_size, approximate=approximate
+            ).items()
+        }
+    else:
+        file_items, total_items = describe_files(
+            input_paths,
+            pid=pid,
+            chunk_size=chunk_size,
+            approximate=approximate,
+            jobs=jobs,
+        )
+        data = {
+            "items": total_items,
+            "files": [
+                {"path": str(path), "items": items}
+                for path, items in zip(input_paths, file_items)
+            ],
+        }
+
+    _output_statistics(data, output_path)
+
+
 def _parse_arguments_describe():
     parser = argparse.ArgumentParser(prog="asreview data describe")
-    parser.add_argument("input_path", type=str, help="The file path of the dataset.")
+    parser.add_argument(
+        "input_path",
+        type=str,
+        nargs="+",
+        help=(
+            "The file paths of the datasets, or glob patterns like 'data/*.csv'. The"
+            " statistics of several datasets are reported for every dataset and for"
+            " all datasets together."
+        ),
+    )
     parser.add_argument(
         "--output_path",
         "-o",
@@ -94,5 +664,44 @@ def _parse_arguments_describe():
         type=str,
         help="The file path of the dataset.",
     )
+    parser.add_argument(
+        "--pid",
+        default="doi",
+        type=str,
+        nargs="+",
+        help=(
+            "Persistent identifier used for counting duplicates and for the"
+            " coverage of the identifiers. Several identifiers can be given,"
+            " records with the same value for any of them are duplicates."
+            " Default: doi."
+        ),
+    )
+    parser.add_argument(
+        "--chunk-size",
+        dest="chunk_size",
+        type=int,
+        default=None,
+        help=(
+            "Read the dataset in chunks of this number of records, so that only one"
+            " chunk is kept in memory. Only for CSV, TSV, RIS, Parquet and Feather"
+            " files. By default, the dataset is loaded into memory at once."
+        ),
+    )
+    parser.add_argument(
+        "--approximate",
+        action="store_true",
+        help=(
+            "Estimate the number of duplicates with HyperLogLog sketches, which take"
+            " constant memory. The estimate is a lower bound if several identifiers"
+            " are used."
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of processes describing the datasets in parallel. Default: 1.",
+    )
 
     return parser
@@ -1,21 +1,18 @@
 import argparse
 
-from asreview.data import load_data
 from asreview.entry_points import BaseEntryPoint
 
 from asreviewcontrib.datatools import __version__
-from asreviewcontrib.datatools.compose import _parse_arguments_compose
-from asreviewcontrib.datatools.compose import compose
-from asreviewcontrib.datatools.convert import _parse_arguments_convert
-from asreviewcontrib.datatools.convert import convert
-from asreviewcontrib.datatools.describe import _parse_arguments_describe
-from asreviewcontrib.datatools.describe import describe
-from asreviewcontrib.datatools.snowball import _parse_arguments_snowball
-from asreviewcontrib.datatools.snowball import snowball
-from asreviewcontrib.datatools.stack import _parse_arguments_vstack
-from asreviewcontrib.datatools.stack import vstack
 
-DATATOOLS = ["describe", "dedup", "convert", "compose", "vstack", "snowball"]
+DATATOOLS = [
+    "describe",
+    "dedup",
+    "convert",
+    "compose",
+    "vstack",
+    "snowball",
+    "pipeline",
+]
 
 
 class DataEntryPoint(BaseEntryPoint):
@@ -31,63 +28,33 @@ class DataEntryPoint(BaseEntryPoint):
 
     def execute(self, argv):
         if len(argv) > 1 and argv[0] in DATATOOLS:
+            # The modules of the subcommands are imported when the subcommand is
+            # run, so that every run only loads the dependencies it needs.
             if argv[0] == "describe":
+                from asreviewcontrib.datatools.describe import _parse_arguments_describe
+                from asreviewcontrib.datatools.describe import describe
+
                 args_describe_parser = _parse_arguments_describe()
                 args_describe = vars(args_describe_parser.parse_args(argv[1:]))
                 describe(**args_describe)
             if argv[0] == "convert":
+                from asreviewcontrib.datatools.convert import _parse_arguments_convert
+                from asreviewcontrib.datatools.convert import convert
+
                 args_convert_parser = _parse_arguments_convert()
                 args_convert = vars(args_convert_parser.parse_args(argv[1:]))
                 convert(**args_convert)
             if argv[0] == "dedup":
-                dedup_parser = argparse.ArgumentParser(prog="asreview data dedup")
-                dedup_parser.add_argument(
-                    "input_path", type=str, help="The file path of the dataset."
-                )
-                dedup_parser.add_argument(
-                    "--output_path",
-                    "-o",
-                    default=None,
-                    type=str,
-                    help="The file path of the dataset.",
-                )
-                dedup_parser.add_argument(
-                    "--pid",
-                    default="doi",
-                    type=str,
-                    help="Persistent identifier used for deduplication. Default: doi.",
-                )
+                from asreviewcontrib.datatools.dedup import _parse_arguments_dedup
+                from asreviewcontrib.datatools.dedup import dedup
 
-                args_dedup = dedup_parser.parse_args(argv[1:])
-
-                # read data in ASReview data object
-                asdata = load_data(args_dedup.input_path)
-                initial_length = len(asdata.df)
-
-                if args_dedup.pid not in asdata.df.columns:
-                    print(
-                        f"Not using {args_dedup.pid} for deduplication"
-                        "because there is no such data."
-                    )
-
-                # retrieve deduplicated ASReview data object
-                asdata.drop_duplicates(pid=args_dedup.pid, inplace=True)
-
-                # count duplicates
-                n_dup = initial_length - len(asdata.df)
-
-                if args_dedup.output_path:
-                    asdata.to_file(args_dedup.output_path)
-                    print(
-                        f"Removed {n_dup} duplicates from dataset with"
-                        f" {initial_length} records."
-                    )
-                else:
-                    print(
-                        f"Found {n_dup} duplicates in dataset with"
-                        f" {initial_length} records."
-                    )
+                args_dedup_parser = _parse_arguments_dedup()
+                args_dedup = vars(args_dedup_parser.parse_args(argv[1:]))
+                dedup(**args_dedup)
             if argv[0] == "compose":
+                from asreviewcontrib.datatools.compose import _parse_arguments_compose
+                from asreviewcontrib.datatools.compose import compose
+
                 args_compose_parser = _parse_arguments_compose()
                 args_compose = args_compose_parser.parse_args(argv[1:])
                 compose(
@@ -99,15 +66,37 @@ class DataEntryPoint(BaseEntryPoint):
                     pid=args_compose.pid,
                     order=args_compose.hierarchy,
                     resolve=args_compose.conflict_resolve,
+                    jobs=args_compose.jobs,
+                    merge=args_compose.merge,
+                    precedence=args_compose.precedence,
+                    base=args_compose.base,
                 )
             if argv[0] == "snowball":
+                from asreviewcontrib.datatools.snowball import _parse_arguments_snowball
+                from asreviewcontrib.datatools.snowball import snowball
+
                 args_snowballing_parser = _parse_arguments_snowball()
                 args_snowballing = vars(args_snowballing_parser.parse_args(argv[1:]))
                 snowball(**args_snowballing)
             if argv[0] == "vstack":
+                from asreviewcontrib.datatools.stack import _parse_arguments_vstack
+                from asreviewcontrib.datatools.stack import vstack
+
                 args_vstack_parser = _parse_arguments_vstack()
                 args_vstack = args_vstack_parser.parse_args(argv[1:])
-                vstack(args_vstack.output_path, args_vstack.datasets)
+                vstack(
+                    args_vstack.output_path,
+                    args_vstack.datasets,
+                    chunk_size=args_vstack.chunk_size,
+                    jobs=args_vstack.jobs,
+                )
+            if argv[0] == "pipeline":
+                from asreviewcontrib.datatools.pipeline import _parse_arguments_pipeline
+                from asreviewcontrib.datatools.pipeline import pipeline
+
+                args_pipeline_parser = _parse_arguments_pipeline()
+                args_pipeline = vars(args_pipeline_parser.parse_args(argv[1:]))
+                pipeline(**args_pipeline)
 
         # Print help message if subcommand not given or incorrect
         else:
@@ -0,0 +1,391 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+import rispy
+from asreview.config import COLUMN_DEFINITIONS
+from asreview.data.base import ASReviewData
+from asreview.data.base import load_data
+from asreview.io import RISReader
+from asreview.io import RISWriter
+from asreview.io.utils import _standardize_dataframe
+from asreview.io.utils import get_writer_class
+from asreview.io.utils import type_from_column
+from pandas.api.types import infer_dtype
+
+SUFFIXES_RIS = {".txt", ".ris"}
+SUFFIXES_TABULAR_SEP = {".csv": ",", ".tab": "\t", ".tsv": "\t"}
+# Columnar formats, read and written with pyarrow. Feather files are Arrow IPC
+# files, also known by the suffix .arrow.
+SUFFIXES_COLUMNAR = {".parquet": "parquet", ".feather": "feather", ".arrow": "feather"}
+# Encodings tried when reading a file, in the same order as the ASReview readers.
+ENCODINGS_TABULAR = ["utf-8", "ISO-8859-1"]
+ENCODINGS_RIS = ["utf-8", "utf-8-sig", "ISO-8859-1"]
+# Size of the blocks read when detecting the encoding of a file.
+BLOCK_SIZE = 2**20
+# Line with the number of a record, written by rispy before the type of every record.
+RIS_HEADER = re.compile(r"^(\d+)\.\n(?=TY  - )", re.MULTILINE)
+
+
+def _detect_encoding(fp, encodings):
+    # The whole file is decoded block by block, so that a file that is not valid
+    # UTF-8 near its end is still read with the right encoding.
+    for encoding in encodings:
+        try:
+            with open(fp, encoding=encoding) as f:
+                while f.read(BLOCK_SIZE):
+                    pass
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    raise ValueError(f"Cannot find proper encoding for data file {fp}")
+
+
+class _RISChunkReader(RISReader):
+    # The RIS reader of ASReview reads whole files. Its file reading hook is
+    # replaced to parse a chunk of RIS text instead, so that the same processing of
+    # the entries (notes, labels, column names) is applied to every chunk.
+    @classmethod
+    def _read_from_file(cls, fp, encoding="utf8"):
+        return rispy.loads(fp, skip_unknown_tags=True)
+
+
+def _columnar_schema(fp):
+    # Column names of a Parquet or Feather file, read from its metadata.
+    if SUFFIXES_COLUMNAR[Path(fp).suffix] == "parquet":
+        import pyarrow.parquet as pq
+
+        return pq.read_schema(fp).names
+    else:
+        import pyarrow.ipc
+
+        with pyarrow.ipc.open_file(fp) as reader:
+            return reader.schema.names
+
+
+def _project_columns(names, columns):
+    # The columns whose name or standardized name is requested. ASReview needs a
+    # title or abstract, so the first of these is always kept.
+    if columns is None:
+        return list(names)
+
+    types = {name: type_from_column(name.strip(), COLUMN_DEFINITIONS) for name in names}
+    projected = [
+        name for name in names if name.strip() in columns or types[name] in columns
+    ]
+    if not any(types[name] in ("title", "abstract") for name in projected):
+        for data_type in ("title", "abstract"):
+            text_columns = [name for name in names if types[name] == data_type]
+            if text_columns:
+                projected.append(text_columns[0])
+                break
+    # in the order of the file
+    return [name for name in names if name in projected]
+
+
+def read_data(fp, columns: list[str] | None = None) -> ASReviewData:
+    """Read a dataset, including Parquet and Feather files.
+
+    Parquet (.parquet) and Feather (.feather, .arrow) files are read with pyarrow
+    and processed like the files read by ASReview. Other files are read with
+    `asreview.load_data`. A dataset that is already loaded is used as it is, so
+    that the tools can be chained in memory.
+
+    Parameters
+    ----------
+    fp : str, pathlib.Path, ASReviewData
+        Location of the file, or a loaded dataset.
+    columns : list[str] | None, optional
+        Only read these columns, given by their name in the file or by their
+        standardized name, for example 'title' or 'included'. Columns that are not
+        in the file are skipped. Parquet and Feather files only read the requested
+        columns from disk, other files are projected after reading. By default
+        None, meaning all columns.
+
+    Returns
+    -------
+    ASReviewData
+        The dataset.
+    """
+    if isinstance(fp, ASReviewData):
+        asdata = fp
+    elif Path(fp).suffix in SUFFIXES_COLUMNAR:
+        names = _project_columns(_columnar_schema(fp), columns)
+        if SUFFIXES_COLUMNAR[Path(fp).suffix] == "parquet":
+            df = pd.read_parquet(fp, columns=names)
+        else:
+            df = pd.read_feather(fp, columns=names)
+        df, column_spec = _standardize_dataframe(df)
+        return ASReviewData(df=df, column_spec=column_spec)
+    else:
+        asdata = load_data(fp)
+
+    if columns is not None:
+        asdata = ASReviewData(
+            df=asdata.df[_project_columns(asdata.df.columns, columns)]
+        )
+    return asdata
+
+
+def _to_arrow_types(df):
+    # Arrow columns have a single type. Columns that mix types, for example numbers
+    # and text after stacking a RIS and a CSV dataset, are written as text. Lists,
+    # for example the URLs of RIS records, are kept.
+    for column in df.select_dtypes(include="object").columns:
+        values = df[column]
+        if infer_dtype(values, skipna=True).startswith("mixed") and not (
+            values.dropna().map(type).eq(list).all()
+        ):
+            df[column] = values.where(values.isna(), values.astype(str))
+    return df
+
+
+def write_data(asdata: ASReviewData, fp) -> None:
+    """Write a dataset, including Parquet and Feather files.
+
+    Parquet (.parquet) and Feather (.feather, .arrow) files are written with
+    pyarrow, with the record identifiers in the column `record_id`. Other files are
+    written with `ASReviewData.to_file`.
+
+    Parameters
+    ----------
+    asdata : ASReviewData
+        The dataset.
+    fp : str, pathlib.Path
+        Location of the output file.
+    """
+    suffix = Path(fp).suffix
+    if suffix in SUFFIXES_COLUMNAR:
+        df = _to_arrow_types(asdata.df.rename_axis("record_id").reset_index())
+        if SUFFIXES_COLUMNAR[suffix] == "parquet":
+            df.to_parquet(fp, index=False)
+        else:
+            df.to_feather(fp)
+    else:
+        asdata.to_file(fp)
+
+
+def read_columns(fp) -> list[str]:
+    """Read the column names of a tabular file without reading the records.
+
+    Parameters
+    ----------
+    fp : str, pathlib.Path
+        Location of the file.
+
+    Returns
+    -------
+    list[str]
+        Column names, as they are named after reading the file with `iter_chunks`.
+    """
+    if Path(fp).suffix in SUFFIXES_COLUMNAR:
+        columns = [name.strip() for name in _columnar_schema(fp)]
+    else:
+        encoding = _detect_encoding(fp, ENCODINGS_TABULAR)
+        df = pd.read_csv(fp, sep=None, encoding=encoding, engine="python", nrows=0)
+        columns = list(df.columns.str.strip())
+    # The record identifiers become the index of the records.
+    return [column for column in columns if column != "record_id"]
+
+
+def _iter_feather_batches(fp, chunk_size):
+    # The record batches of a Feather file are read and decompressed one by one,
+    # and split into chunks.
+    import pyarrow.ipc
+
+    with pyarrow.ipc.open_file(fp) as reader:
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            for start in range(0, batch.num_rows, chunk_size):
+                yield batch.slice(start, chunk_size)
+
+
+def iter_chunks(fp, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Read a CSV, TSV, RIS, Parquet or Feather dataset in chunks of records.
+
+    Every chunk is processed like a dataset read with `asreview.load_data`, but only
+    one chunk is kept in memory. The values in CSV and TSV files are read as text,
+    so that they are written back unchanged, no matter in which chunk they are.
+
+    Parameters
+    ----------
+    fp : str, pathlib.Path
+        Location of the file.
+    chunk_size : int
+        Maximum number of records in a chunk.
+
+    Yields
+    ------
+    pandas.DataFrame
+        The records in the chunk.
+    """
+    suffix = Path(fp).suffix
+    if suffix in SUFFIXES_TABULAR_SEP:
+        encoding = _detect_encoding(fp, ENCODINGS_TABULAR)
+        with pd.read_csv(
+            fp,
+            sep=None,
+            encoding=encoding,
+            engine="python",
+            dtype=str,
+            chunksize=chunk_size,
+        ) as reader:
+            for df in reader:
+                yield _standardize_dataframe(df)[0]
+    elif suffix in SUFFIXES_RIS:
+        encoding = _detect_encoding(fp, ENCODINGS_RIS)
+        with open(fp, encoding=encoding) as f:
+            lines, n_records = [], 0
+            for line in f:
+                lines.append(line)
+                if line.startswith("ER  -"):
+                    n_records += 1
+                    if n_records == chunk_size:
+                        yield _RISChunkReader.read_data("".join(lines))[0]
+                        lines, n_records = [], 0
+            if n_records > 0:
+                yield _RISChunkReader.read_data("".join(lines))[0]
+    elif suffix in SUFFIXES_COLUMNAR:
+        if SUFFIXES_COLUMNAR[suffix] == "parquet":
+            import pyarrow.parquet as pq
+
+            batches = pq.ParquetFile(fp).iter_batches(batch_size=chunk_size)
+        else:
+            batches = _iter_feather_batches(fp, chunk_size)
+        for batch in batches:
+            yield _standardize_dataframe(batch.to_pandas())[0]
+    else:
+        raise ValueError(f"Reading {suffix} files in chunks is not supported.")
+
+
+def _read_data(fp):
+    return read_data(fp) if fp is not None else None
+
+
+def load_datasets(input_files, jobs: int = 1) -> list:
+    """Load several datasets, in parallel processes if `jobs` is larger than 1.
+
+    Parsing a dataset, in particular a RIS file, is CPU-bound, so the files are
+    parsed in a process pool instead of threads.
+
+    Parameters
+    ----------
+    input_files : list
+        Locations of the datasets. Locations that are None are skipped.
+    jobs : int, optional
+        Number of processes parsing the datasets, by default 1
+
+    Returns
+    -------
+    list
+        ASReviewData objects in the same order as `input_files`, with None for the
+        locations that are None.
+    """
+    n_files = len([item for item in input_files if item is not None])
+    if jobs <= 1 or n_files <= 1:
+        return [_read_data(item) for item in input_files]
+
+    with ProcessPoolExecutor(max_workers=min(jobs, n_files)) as executor:
+        return list(executor.map(_read_data, input_files))
+
+
+class ChunkedWriter:
+    """Write a dataset to a file in chunks of records.
+
+    CSV, TSV and RIS files are appended to with every chunk, so only one chunk has
+    to be kept in memory. Chunks for other file formats are collected and written
+    when the writer is closed. The records are numbered consecutively over all
+    chunks.
+
+    Parameters
+    ----------
+    fp : str, pathlib.Path, None
+        Location of the output file. If None, the chunks are collected in memory
+        and stacked in the attribute `df` when the writer is closed.
+    """
+
+    def __init__(self, fp):
+        self.fp = Path(fp) if fp is not None else None
+        self.suffix = self.fp.suffix if fp is not None else None
+        self.df = None
+        self.n_records = 0
+        self._chunks = []
+        self._columns = None
+
+        if self.suffix in SUFFIXES_RIS or self.suffix in SUFFIXES_TABULAR_SEP:
+            self._file = open(self.fp, "w", encoding="utf8", newline="")
+        else:
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write(self, df: pd.DataFrame) -> None:
+        """Append a chunk of records to the output file.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            Records to write. The index is replaced by the record numbers in the
+            output file.
+        """
+        df = df.set_axis(range(self.n_records, self.n_records + len(df)))
+
+        if self.suffix in SUFFIXES_TABULAR_SEP:
+            # Align the columns of all chunks with the columns of the first one,
+            # which are written as the header.
+            header = self._columns is None
+            if header:
+                self._columns = list(df.columns)
+            df.reindex(columns=self._columns).to_csv(
+                self._file,
+                sep=SUFFIXES_TABULAR_SEP[self.suffix],
+                index=True,
+                header=header,
+            )
+        elif self.suffix in SUFFIXES_RIS:
+            # The tags of every record are written in the order of the columns, so
+            # the columns of all chunks are aligned. Columns that are not in the
+            # earlier chunks are added at the end.
+            if self._columns is None:
+                self._columns = []
+            self._columns += [
+                column for column in df.columns if column not in self._columns
+            ]
+            if len(df) > 0:
+                # Records are separated by a blank line, also between chunks.
+                if self.n_records > 0:
+                    self._file.write("\n")
+                ris = RISWriter.write_data(df.reindex(columns=self._columns), None)
+                # rispy numbers the records of every chunk from 1
+                self._file.write(
+                    RIS_HEADER.sub(
+                        lambda m: f"{int(m.group(1)) + self.n_records}.\n", ris
+                    )
+                )
+        else:
+            self._chunks.append(df)
+
+        self.n_records += len(df)
+
+    def close(self) -> None:
+        """Finish writing the output file."""
+        if self._file is not None:
+            self._file.close()
+        elif self.fp is None:
+            self.df = pd.concat(self._chunks) if self._chunks else pd.DataFrame()
+            self._chunks = []
+        elif self._chunks:
+            df = pd.concat(self._chunks)
+            if self.suffix in SUFFIXES_COLUMNAR:
+                write_data(ASReviewData(df=df), self.fp)
+            else:
+                get_writer_class(self.suffix).write_data(df, self.fp)
+            self._chunks = []
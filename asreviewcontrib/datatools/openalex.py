@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections.abc import Iterator
+from urllib.parse import urlsplit
+from urllib.parse import urlunsplit
+
+import pyalex
+import requests
+from pyalex.api import OpenAlexAuth
+
+OPENALEX_URL = "https://api.openalex.org"
+# Maximum number of requests per second of the OpenAlex polite pool.
+DEFAULT_RATE_LIMIT = 10
+# Requests with these status codes are retried.
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# Timeout in seconds of a single request.
+REQUEST_TIMEOUT = 60
+
+
+class _TokenBucket:
+    """Thread-safe token bucket allowing on average `rate` calls per second.
+
+    The rate adapts to the server: it is halved when the server signals that too
+    many requests are sent and it slowly grows back to the maximum rate after
+    successful requests.
+    """
+
+    def __init__(self, rate: float | None = None, capacity: float | None = None):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1, rate or 1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self.rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            # Reserve a token; a negative number of tokens is the waiting line.
+            self._tokens -= 1
+            wait_time = -self._tokens / self.rate
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+    def slow_down(self) -> None:
+        if not self.rate:
+            return
+        with self._lock:
+            self.rate = max(self.max_rate / 32, self.rate / 2)
+
+    def speed_up(self) -> None:
+        if not self.rate:
+            return
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+class OpenAlexClient:
+    """Request layer for the OpenAlex API shared by all snowballing functions.
+
+    The queries are built with pyalex, but they are sent by this client. It limits
+    the number of requests per second with a token bucket that slows down when
+    OpenAlex responds with status 429, retries failed requests with exponential
+    backoff and jitter, and counts the requests, retries and latencies.
+
+    Parameters
+    ----------
+    requests_per_second : float | None, optional
+        Maximum number of requests per second, shared by all threads using the
+        client, by default DEFAULT_RATE_LIMIT (the limit of the OpenAlex polite
+        pool). 0 or None means no limit.
+    max_retries : int, optional
+        Maximum number of retries of a failed request, by default 5
+    backoff_factor : float, optional
+        The n-th retry waits a random time between 0 and `backoff_factor * 2**n`
+        seconds, by default 0.5
+    max_backoff : float, optional
+        Maximum waiting time in seconds before a retry, by default 60
+    base_url : str, optional
+        Base URL of the OpenAlex API, by default OPENALEX_URL
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float | None = DEFAULT_RATE_LIMIT,
+        max_retries: int = 5,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 60,
+        base_url: str = OPENALEX_URL,
+    ):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.base_url = base_url.rstrip("/")
+
+        self._bucket = _TokenBucket(requests_per_second)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.n_requests = 0
+        self.n_retries = 0
+        self.n_rate_limited = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    @property
+    def _session(self) -> requests.Session:
+        # Sessions are not shared between threads.
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def _url(self, query: pyalex.api.BaseOpenAlex) -> str:
+        # pyalex builds the URL for the public API, the base URL is replaced.
+        parts = urlsplit(query.url)
+        base = urlsplit(self.base_url)
+        return urlunsplit(
+            (base.scheme, base.netloc, base.path + parts.path, parts.query, "")
+        )
+
+    def _backoff_time(self, attempt: int, response: requests.Response | None) -> float:
+        backoff_time = random.uniform(
+            0, min(self.max_backoff, self.backoff_factor * 2**attempt)
+        )
+        if response is not None:
+            try:
+                backoff_time = max(backoff_time, float(response.headers["Retry-After"]))
+            except (KeyError, ValueError):
+                pass
+        return min(backoff_time, self.max_backoff)
+
+    def _request(self, url: str, params: dict) -> dict:
+        for attempt in range(self.max_retries + 1):
+            self._bucket.acquire()
+            start = time.monotonic()
+            try:
+                response = self._session.get(
+                    url,
+                    params=params,
+                    auth=OpenAlexAuth(pyalex.config),
+                    timeout=REQUEST_TIMEOUT,
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                response = None
+            latency = time.monotonic() - start
+
+            with self._lock:
+                self.n_requests += 1
+                self.total_latency += latency
+                self.max_latency = max(self.max_latency, latency)
+
+            if response is not None:
+                if response.status_code == 429:
+                    with self._lock:
+                        self.n_rate_limited += 1
+                    self._bucket.slow_down()
+                elif response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    self._bucket.speed_up()
+                    return response.json()
+
+            if attempt == self.max_retries:
+                response.raise_for_status()
+            with self._lock:
+                self.n_retries += 1
+            time.sleep(self._backoff_time(attempt, response))
+
+    def get(self, query: pyalex.api.BaseOpenAlex, per_page: int) -> list[dict]:
+        """Get the first page of results of a query.
+
+        Parameters
+        ----------
+        query : pyalex.api.BaseOpenAlex
+            The query, for example `pyalex.Works().filter(doi=...)`.
+        per_page : int
+            Number of results on a page.
+
+        Returns
+        -------
+        list[dict]
+            The results of the query.
+        """
+        return self._request(self._url(query), {"per-page": per_page})["results"]
+
+    def paginate(
+        self, query: pyalex.api.BaseOpenAlex, per_page: int
+    ) -> Iterator[list[dict]]:
+        """Get all results of a query, page by page.
+
+        Parameters
+        ----------
+        query : pyalex.api.BaseOpenAlex
+            The query, for example `pyalex.Works().filter(cites=...)`.
+        per_page : int
+            Number of results on a page.
+
+        Yields
+        ------
+        list[dict]
+            The results on a page.
+        """
+        url = self._url(query)
+        cursor = "*"
+        while cursor is not None:
+            response = self._request(url, {"per-page": per_page, "cursor": cursor})
+            cursor = response["meta"].get("next_cursor")
+            if response["results"]:
+                yield response["results"]
+            else:
+                break
+
+    def summary(self) -> str:
+        """Summary of the requests sent by the client."""
+        mean_latency = self.total_latency / self.n_requests if self.n_requests else 0
+        return (
+            f"Sent {self.n_requests} requests to OpenAlex ({self.n_retries} retries,"
+            f" {self.n_rate_limited} rate limited), mean latency"
+            f" {mean_latency:.2f}s, max latency {self.max_latency:.2f}s."
+        )
@@ -0,0 +1,251 @@
+import argparse
+import json
+from pathlib import Path
+
+from asreview import ASReviewData
+
+from asreviewcontrib.datatools.cache import DEFAULT_CACHE_DIR
+from asreviewcontrib.datatools.compose import _output_composition
+from asreviewcontrib.datatools.compose import create_composition
+from asreviewcontrib.datatools.dedup import deduplicate
+from asreviewcontrib.datatools.describe import _output_statistics
+from asreviewcontrib.datatools.describe import describe_statistics
+from asreviewcontrib.datatools.io import load_datasets
+from asreviewcontrib.datatools.io import write_data
+from asreviewcontrib.datatools.openalex import DEFAULT_RATE_LIMIT
+from asreviewcontrib.datatools.snowball import snowball
+from asreviewcontrib.datatools.stack import stack_datasets
+
+SUFFIXES_YAML = {".yaml", ".yml"}
+# Input of the composition that the dataset of the pipeline is used as.
+COMPOSE_ROLES = ["relevant", "irrelevant", "labeled", "unlabeled"]
+
+
+def _step_vstack(asdata, input_files, jobs=1):
+    # the datasets are stacked below the dataset of the pipeline
+    datasets = load_datasets(input_files, jobs=jobs)
+    if asdata is not None:
+        datasets.insert(0, asdata)
+    return stack_datasets(datasets)
+
+
+def _step_dedup(asdata, pid="doi", threshold=None, merge=False, precedence=None):
+    n_records = len(asdata.df)
+    asdata = deduplicate(
+        asdata, pid=pid, threshold=threshold, merge=merge, precedence=precedence
+    )
+    print(
+        f"Removed {n_records - len(asdata.df)} duplicates from dataset with"
+        f" {n_records} records."
+    )
+    return asdata
+
+
+def _step_compose(
+    asdata,
+    role="unlabeled",
+    relevant=None,
+    irrelevant=None,
+    labeled=None,
+    unlabeled=None,
+    **kwargs,
+):
+    if role not in COMPOSE_ROLES:
+        raise ValueError(
+            f"Role '{role}' not found, should be one of the following: {COMPOSE_ROLES}"
+        )
+    inputs = {
+        "relevant": relevant,
+        "irrelevant": irrelevant,
+        "labeled": labeled,
+        "unlabeled": unlabeled,
+    }
+    if asdata is not None:
+        if inputs[role] is not None:
+            raise ValueError(
+                f"The dataset of the pipeline is used as the {role} input of compose,"
+                f" '{role}' cannot be given as well."
+            )
+        inputs[role] = asdata
+    df_composed = create_composition(*inputs.values(), **kwargs)
+    return ASReviewData(df=df_composed)
+
+
+def _step_snowball(
+    asdata,
+    forward=False,
+    backward=False,
+    rate_limit=DEFAULT_RATE_LIMIT,
+    cache_dir=DEFAULT_CACHE_DIR,
+    **kwargs,
+):
+    # the same throttling and cache of OpenAlex responses as the snowball command
+    df_works = snowball(
+        asdata,
+        None,
+        forward,
+        backward,
+        rate_limit=rate_limit,
+        cache_dir=cache_dir,
+        **kwargs,
+    )
+    return ASReviewData(df=df_works)
+
+
+def _step_describe(asdata, output_path=None, pid="doi", approximate=False):
+    items = describe_statistics(asdata, pid=pid, approximate=approximate)
+    _output_statistics({"items": items}, output_path)
+    # the dataset is passed on to the next step unchanged
+    return asdata
+
+
+# Functions running the steps on the dataset of the pipeline, which is None before
+# the first dataset is read.
+PIPELINE_STEPS = {
+    "vstack": _step_vstack,
+    "dedup": _step_dedup,
+    "compose": _step_compose,
+    "snowball": _step_snowball,
+    "describe": _step_describe,
+}
+
+
+def read_spec(spec_path) -> dict:
+    """Read the specification of a pipeline from a JSON or YAML file.
+
+    Parameters
+    ----------
+    spec_path : str, pathlib.Path
+        Location of the specification. Files ending with .yaml or .yml are read as
+        YAML, which requires PyYAML, other files as JSON.
+
+    Returns
+    -------
+    dict
+        The specification.
+    """
+    with open(spec_path) as f:
+        if Path(spec_path).suffix in SUFFIXES_YAML:
+            try:
+                import yaml
+            except ImportError as err:
+                raise ImportError(
+                    "Reading YAML files requires PyYAML, install it with"
+                    " 'pip install asreview-datatools[yaml]'."
+                ) from err
+
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def run_pipeline(spec) -> ASReviewData:
+    """Run the steps of a pipeline on a dataset in memory.
+
+    The dataset is passed from step to step without writing or reading
+    intermediate files. The specification is a dictionary like::
+
+        {
+            "input": ["search_1.ris", "search_2.ris"],
+            "steps": [
+                {"step": "dedup", "pid": "doi"},
+                {"step": "compose", "role": "unlabeled", "relevant": "rel.ris"},
+                {"step": "describe", "output_path": "statistics.json"},
+            ],
+            "output": "composed.ris",
+        }
+
+    The datasets in `input` are stacked into the dataset of the pipeline. Every step
+    has a name in `step`, the other keys are the arguments of the step:
+
+    - vstack: stack the datasets in `input_files` below the dataset, see `vstack`.
+    - dedup: remove the duplicates, see `deduplicate`.
+    - compose: compose a dataset with the dataset as the input given by `role`
+      (relevant, irrelevant, labeled or unlabeled, by default unlabeled) and the
+      other inputs given by their location, see `create_composition`.
+    - snowball: replace the dataset by the works found by snowballing, see
+      `snowball`. Like the snowball command, at most `rate_limit` requests per
+      second are sent and the responses are cached in `cache_dir`, by default
+      DEFAULT_RATE_LIMIT and DEFAULT_CACHE_DIR.
+    - describe: write the statistics of the dataset to `output_path`, see
+      `describe`. The dataset is not changed.
+
+    Parameters
+    ----------
+    spec : dict
+        Specification of the pipeline, with the optional keys `input` (location or
+        list of locations of datasets), `steps` (list of steps) and `output`
+        (location of the output dataset).
+
+    Returns
+    -------
+    ASReviewData
+        The dataset after the last step.
+    """
+    asdata = None
+    if spec.get("input") is not None:
+        input_files = spec["input"]
+        if isinstance(input_files, str):
+            input_files = [input_files]
+        asdata = stack_datasets(load_datasets(input_files))
+
+    composed = False
+    for step in spec.get("steps", []):
+        kwargs = dict(step)
+        name = kwargs.pop("step", None)
+        if name not in PIPELINE_STEPS:
+            raise ValueError(
+                f"Step '{name}' not found, should be one of the following:"
+                f" {list(PIPELINE_STEPS)}"
+            )
+        if asdata is None and name not in ("vstack", "compose"):
+            raise ValueError(
+                f"Step '{name}' needs a dataset, give the datasets in 'input' or start"
+                " the pipeline with 'vstack' or 'compose'."
+            )
+        asdata = PIPELINE_STEPS[name](asdata, **kwargs)
+        # whether the labels of the dataset are composed, the snowball step
+        # replaces the dataset by records without labels
+        composed = name == "compose" or (composed and name != "snowball")
+
+    if asdata is None:
+        raise ValueError("The pipeline has no input datasets.")
+
+    output_path = spec.get("output")
+    if output_path is not None:
+        if composed:
+            # the labels of unlabeled records are written as missing values, like
+            # the output of compose
+            _output_composition(asdata.df, output_path)
+        else:
+            write_data(asdata, output_path)
+            print(f"Saved dataset with {len(asdata.df)} records to {output_path}.")
+
+    return asdata
+
+
+def pipeline(spec_path, output_path=None):
+    spec = read_spec(spec_path)
+    if output_path is not None:
+        spec["output"] = output_path
+    run_pipeline(spec)
+
+
+def _parse_arguments_pipeline():
+    parser = argparse.ArgumentParser(prog="asreview data pipeline")
+    parser.add_argument(
+        "spec_path",
+        type=str,
+        help=(
+            "The file path of the pipeline specification, a JSON or YAML file with"
+            " the input datasets, the steps and the output dataset."
+        ),
+    )
+    parser.add_argument(
+        "--output_path",
+        "-o",
+        default=None,
+        type=str,
+        help="The file path of the output dataset, instead of the one in the spec.",
+    )
+
+    return parser
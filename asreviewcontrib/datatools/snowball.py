@@ -1,18 +1,40 @@
 from __future__ import annotations
 
 import argparse
+import array
+import contextlib
+import datetime
+import itertools
+import json
+import re
+import sqlite3
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pyalex
-from asreview import ASReviewData
-from asreview import load_data
+
+from asreviewcontrib.datatools.cache import DEFAULT_CACHE_DIR
+from asreviewcontrib.datatools.cache import SQLITE_MAX_VARIABLES
+from asreviewcontrib.datatools.cache import OpenAlexCache
+from asreviewcontrib.datatools.io import ChunkedWriter
+from asreviewcontrib.datatools.io import read_data
+from asreviewcontrib.datatools.openalex import DEFAULT_RATE_LIMIT
+from asreviewcontrib.datatools.openalex import OpenAlexClient
 
 # Maximum number of statements joined by a logical OR in a call to OpenAlex.
 OPENALEX_MAX_OR_LENGTH = 100
 OPENALEX_MAX_PAGE_LENGTH = 200
 OPENALEX_PREFIX = "https://openalex.org/"
 DOI_PREFIX = "https://doi.org/"
+# Prefixes of DOIs that are removed before looking them up.
+DOI_PREFIX_PATTERN = re.compile(r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)")
+# Minimal number of records snowballed between two checkpoints.
+CHECKPOINT_INTERVAL = 1000
+# Columns of the input dataset used for snowballing, the other columns are not read.
+INPUT_COLUMNS = ["openalex_id", "doi", "included"]
 
 # OpenAlex data fields to retrieve.
 USED_FIELDS = [
@@ -22,16 +44,114 @@ USED_FIELDS = [
     "abstract_inverted_index",
     "referenced_works",
     "publication_date",
+    "cited_by_count",
+]
+# Fields of the works returned by the snowballing functions.
+OUTPUT_FIELDS = [
+    col if col != "abstract_inverted_index" else "abstract" for col in USED_FIELDS
 ]
 
 
-def forward_snowballing(identifiers: list[str]) -> dict[str, list[dict]]:
+def invert_abstract(inv_index: dict[str, list[int]] | None) -> str | None:
+    """Reconstruct an abstract from an OpenAlex abstract inverted index.
+
+    This gives the same result as `pyalex.invert_abstract`, but it places every word
+    directly in a preallocated list of tokens instead of sorting all (word, position)
+    pairs.
+
+    Parameters
+    ----------
+    inv_index : dict[str, list[int]] | None
+        Dictionary of the form `{word: list of positions of the word}`.
+
+    Returns
+    -------
+    str | None
+        The abstract, or None if there is no inverted index.
+    """
+    if inv_index is None:
+        return None
+
+    tokens = [None] * sum(map(len, inv_index.values()))
+    try:
+        for word, positions in inv_index.items():
+            for position in positions:
+                tokens[position] = word
+    except IndexError:
+        # There are gaps in the positions.
+        return pyalex.invert_abstract(inv_index)
+    if None in tokens:
+        # Several words share a position.
+        return pyalex.invert_abstract(inv_index)
+    return " ".join(tokens)
+
+
+def _work_fields(work: pyalex.Work) -> dict:
+    # The abstract is reconstructed from the raw inverted index instead of the
+    # slower 'abstract' property of pyalex.
+    return {
+        key: (
+            invert_abstract(work["abstract_inverted_index"])
+            if key == "abstract"
+            else work[key]
+        )
+        for key in OUTPUT_FIELDS
+    }
+
+
+def _get_cached_works(cache: OpenAlexCache | None, identifiers: list[str]) -> dict:
+    if cache is None:
+        return {}
+    # Works cached with a different set of fields are fetched again.
+    return {
+        identifier: work
+        for identifier, work in cache.get_many("work", identifiers).items()
+        if all(key in work for key in OUTPUT_FIELDS)
+    }
+
+
+def _get_citing_works(
+    start: int, identifiers: list[str], client: OpenAlexClient
+) -> dict[str, list[dict]]:
+    print(f"Getting works citing records {start}-{start + len(identifiers)}")
+    # We need to remove the prefix here because otherwise the URL is too long.
+    fltr = "|".join(
+        identifier.removeprefix(OPENALEX_PREFIX) for identifier in identifiers
+    )
+    query = pyalex.Works().filter(cites=fltr).select(USED_FIELDS)
+    citing_works = {identifier: [] for identifier in identifiers}
+    for page in client.paginate(query, per_page=OPENALEX_MAX_PAGE_LENGTH):
+        for work in page:
+            work_fields = _work_fields(work)
+            # A work can cite several records from the batch. Its references tell
+            # which ones, so we use them to attribute the work to the right records.
+            for ref_id in work["referenced_works"]:
+                if ref_id in citing_works:
+                    citing_works[ref_id].append(work_fields)
+    return citing_works
+
+
+def forward_snowballing(
+    identifiers: list[str],
+    workers: int = 1,
+    client: OpenAlexClient | None = None,
+    cache: OpenAlexCache | None = None,
+) -> dict[str, list[dict]]:
     """Get all works citing a work with the OpenAlex identifier from the list.
 
     Parameters
     ----------
     identifiers : list[str]
         List of OpenAlex identifiers.
+    workers : int, optional
+        Number of batches of identifiers for which the citing works are fetched in
+        parallel, by default 1
+    client : OpenAlexClient | None, optional
+        Client sending the requests to OpenAlex, shared by all workers. By default
+        None, meaning that a client with the default rate limit is used.
+    cache : OpenAlexCache | None, optional
+        Cache of OpenAlex responses. Only the citing works of identifiers that are
+        not in the cache are requested from OpenAlex, by default None
 
     Returns
     -------
@@ -41,37 +161,72 @@ def forward_snowballing(identifiers: list[str]) -> dict[str, list[dict]]:
         where each work in the list references the work with the input identifier and
         it is a dictionary of the form `{field_name : field_value}`.
     """
+    if workers < 1:
+        raise ValueError("The number of workers should be at least 1.")
+
+    # Get the citing works from the cache. If one of the citing works is no longer
+    # in the cache, the identifier is requested again.
     citing_works = {}
-    for idx, openalex_id in enumerate(identifiers):
-        print(f"{idx}. Getting works citing {openalex_id}")
-        pager = (
-            pyalex.Works()
-            .filter(cites=openalex_id)
-            .select(USED_FIELDS)
-            .paginate(per_page=OPENALEX_MAX_PAGE_LENGTH, n_max=None)
+    if cache is not None:
+        cached_citing_ids = cache.get_many("cites", identifiers)
+        cached_works = _get_cached_works(
+            cache, [i for citing_ids in cached_citing_ids.values() for i in citing_ids]
         )
-        citing_works[openalex_id] = []
-        for page in pager:
-            citing_works[openalex_id] += [
-                {
-                    key: work[key]
-                    for key in [
-                        col if col != "abstract_inverted_index" else "abstract"
-                        for col in USED_FIELDS
-                    ]
-                }
-                for work in page
-            ]
-    return citing_works
-
+        for identifier, citing_ids in cached_citing_ids.items():
+            if all(citing_id in cached_works for citing_id in citing_ids):
+                citing_works[identifier] = [cached_works[i] for i in citing_ids]
+        print(f"Found the citing works of {len(citing_works)} records in the cache")
+    missing_identifiers = list(
+        dict.fromkeys(i for i in identifiers if i not in citing_works)
+    )
 
-def backward_snowballing(identifiers: list[str]) -> dict[str, list[dict]]:
+    # Works citing several identifiers at once are requested with a single filter
+    # of identifiers joined by a logical OR.
+    page_length = min(OPENALEX_MAX_OR_LENGTH, OPENALEX_MAX_PAGE_LENGTH)
+    starts = range(0, len(missing_identifiers), page_length)
+    batches = [missing_identifiers[i : i + page_length] for i in starts]
+
+    client = client if client is not None else OpenAlexClient()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # 'map' returns the results in the order of the input batches, so the
+        # output does not depend on the number of workers.
+        for batch_works in executor.map(
+            _get_citing_works, starts, batches, [client] * len(batches)
+        ):
+            citing_works.update(batch_works)
+            if cache is not None:
+                cache.set_many(
+                    "work",
+                    {w["id"]: w for works in batch_works.values() for w in works},
+                )
+                cache.set_many(
+                    "cites",
+                    {
+                        identifier: [w["id"] for w in works]
+                        for identifier, works in batch_works.items()
+                    },
+                )
+
+    return {identifier: citing_works[identifier] for identifier in identifiers}
+
+
+def backward_snowballing(
+    identifiers: list[str],
+    client: OpenAlexClient | None = None,
+    cache: OpenAlexCache | None = None,
+) -> dict[str, list[dict]]:
     """Get all works cited by a work with the OpenAlex identifier from the list.
 
     Parameters
     ----------
     identifiers : list[str]
         List of OpenAlex identifiers.
+    client : OpenAlexClient | None, optional
+        Client sending the requests to OpenAlex. By default None, meaning that a
+        client with the default rate limit is used.
+    cache : OpenAlexCache | None, optional
+        Cache of OpenAlex responses. Only the references and works that are not in
+        the cache are requested from OpenAlex, by default None
 
     Returns
     -------
@@ -81,24 +236,30 @@ def backward_snowballing(identifiers: list[str]) -> dict[str, list[dict]]:
         where each work in the list is referenced by the work with the input identifier
         and it is a dictionary of the form `{field_name : field_value}`.
     """
+    client = client if client is not None else OpenAlexClient()
+
     # Get the referenced works.
     referenced_works = {}
+    if cache is not None:
+        referenced_works = cache.get_many("references", identifiers)
+    missing_identifiers = [i for i in identifiers if i not in referenced_works]
     page_length = min(OPENALEX_MAX_OR_LENGTH, OPENALEX_MAX_PAGE_LENGTH)
 
-    for i in range(0, len(identifiers), page_length):
+    for i in range(0, len(missing_identifiers), page_length):
         print(f"Getting works citing records {i}-{i+page_length}")
         # We need to remove the prefix here because otherwise the URL is too long.
         fltr = "|".join(
             identifier.removeprefix(OPENALEX_PREFIX)
-            for identifier in identifiers[i : i + page_length]
+            for identifier in missing_identifiers[i : i + page_length]
         )
-        for work in (
-            pyalex.Works()
-            .filter(openalex=fltr)
-            .select("id,referenced_works")
-            .get(per_page=page_length)
-        ):
-            referenced_works[work["id"]] = work["referenced_works"]
+        query = pyalex.Works().filter(openalex=fltr).select("id,referenced_works")
+        batch_references = {
+            work["id"]: work["referenced_works"]
+            for work in client.get(query, per_page=page_length)
+        }
+        referenced_works.update(batch_references)
+        if cache is not None:
+            cache.set_many("references", batch_references)
 
     # Get the fields for the referenced works.
     all_identifiers = []
@@ -107,26 +268,22 @@ def backward_snowballing(identifiers: list[str]) -> dict[str, list[dict]]:
     all_identifiers = list(set(all_identifiers))
     print(f"Found {len(all_identifiers)} records")
 
-    all_referenced_works = {}
-    for i in range(0, len(all_identifiers), page_length):
+    all_referenced_works = _get_cached_works(cache, all_identifiers)
+    missing_identifiers = [i for i in all_identifiers if i not in all_referenced_works]
+    for i in range(0, len(missing_identifiers), page_length):
         # We need to remove the prefix here because otherwise the URL is too long.
         fltr = "|".join(
             identifier.removeprefix(OPENALEX_PREFIX)
-            for identifier in all_identifiers[i : i + page_length]
+            for identifier in missing_identifiers[i : i + page_length]
         )
-        for work in (
-            pyalex.Works()
-            .filter(openalex=fltr)
-            .select(USED_FIELDS)
-            .get(per_page=page_length)
-        ):
-            all_referenced_works[work["id"]] = {
-                key: work[key]
-                for key in [
-                    col if col != "abstract_inverted_index" else "abstract"
-                    for col in USED_FIELDS
-                ]
-            }
+        query = pyalex.Works().filter(openalex=fltr).select(USED_FIELDS)
+        batch_works = {
+            work["id"]: _work_fields(work)
+            for work in client.get(query, per_page=page_length)
+        }
+        all_referenced_works.update(batch_works)
+        if cache is not None:
+            cache.set_many("work", batch_works)
 
     # Connect the referenced works back to the input works.
     output = {}
@@ -144,50 +301,357 @@ def backward_snowballing(identifiers: list[str]) -> dict[str, list[dict]]:
     return output
 
 
-def openalex_from_doi(dois: list[str]) -> dict[str, str]:
+def normalize_doi(doi: str) -> str | None:
+    """Normalize a DOI for lookup in OpenAlex.
+
+    Surrounding whitespace, resolver prefixes like `https://doi.org/` or `doi:` and
+    trailing punctuation are removed and the DOI is lowercased, as DOIs are case
+    insensitive.
+
+    Parameters
+    ----------
+    doi : str
+        The DOI, possibly with a prefix.
+
+    Returns
+    -------
+    str | None
+        The normalized DOI, for example `10.1042/cs20220150`, or None if the string
+        is not a DOI.
+    """
+    if not isinstance(doi, str):
+        return None
+    doi = doi.strip().lower()
+    doi = DOI_PREFIX_PATTERN.sub("", doi)
+    doi = doi.rstrip(".,;")
+    if not doi.startswith("10.") or "/" not in doi:
+        return None
+    return doi
+
+
+def _get_openalex_ids(dois: list[str], client: OpenAlexClient) -> dict[str, str]:
+    """Get the OpenAlex identifiers of a batch of normalized DOIs."""
+    batch_mapping = dict.fromkeys(dois)
+    query = pyalex.Works().filter(doi="|".join(dois)).select(["id", "doi"])
+    for work in client.get(query, per_page=len(dois)):
+        doi = normalize_doi(work["doi"])
+        if doi in batch_mapping:
+            batch_mapping[doi] = work["id"]
+    return batch_mapping
+
+
+def openalex_from_doi(
+    dois: list[str],
+    workers: int = 1,
+    client: OpenAlexClient | None = None,
+    cache: OpenAlexCache | None = None,
+) -> dict[str, str]:
     """Get the OpenAlex identifiers corresponding to a list of DOIs.
 
+    The DOIs are normalized with `normalize_doi` and deduplicated before they are
+    requested from OpenAlex. Strings that are not DOIs are not requested.
+
     Parameters
     ----------
     dois : list[str]
         List of DOIs.
+    workers : int, optional
+        Number of batches of DOIs requested in parallel, by default 1
+    client : OpenAlexClient | None, optional
+        Client sending the requests to OpenAlex. By default None, meaning that a
+        client with the default rate limit is used.
+    cache : OpenAlexCache | None, optional
+        Cache of OpenAlex responses. Only the DOIs that are not in the cache are
+        requested from OpenAlex, by default None
 
     Returns
     -------
     dict[str, str]
-        Dictionary {doi: openalex_id}. If there was no OpenAlex identifier found for a
-        DOI, the corresponding value will be None.
+        Dictionary {doi: openalex_id}, where the keys are the normalized DOIs. If there
+        was no OpenAlex identifier found for a DOI, the corresponding value will be
+        None. Strings that are not DOIs are kept as they are and map to None.
     """
+    client = client if client is not None else OpenAlexClient()
+    id_mapping = {}
+    for doi in dois:
+        normalized_doi = normalize_doi(doi)
+        id_mapping[normalized_doi if normalized_doi is not None else doi] = None
+
+    # Commas and pipes separate the values of OpenAlex filters, so DOIs containing
+    # them cannot be requested.
+    missing_dois = [
+        doi
+        for doi in id_mapping
+        if normalize_doi(doi) == doi and "," not in doi and "|" not in doi
+    ]
+    if cache is not None:
+        cached_mapping = cache.get_many("doi", missing_dois)
+        id_mapping.update(cached_mapping)
+        missing_dois = [doi for doi in missing_dois if doi not in cached_mapping]
+
     page_length = min(OPENALEX_MAX_OR_LENGTH, OPENALEX_MAX_PAGE_LENGTH)
-    id_mapping = {doi.removeprefix(DOI_PREFIX): None for doi in dois}
-    for i in range(0, len(dois), page_length):
-        fltr = "|".join(dois[i : i + page_length])
-        for work in (
-            pyalex.Works()
-            .filter(doi=fltr)
-            .select(["id", "doi"])
-            .get(per_page=page_length)
+    batches = [
+        missing_dois[i : i + page_length]
+        for i in range(0, len(missing_dois), page_length)
+    ]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for batch_mapping in executor.map(
+            _get_openalex_ids, batches, [client] * len(batches)
         ):
-            id_mapping[work["doi"].removeprefix(DOI_PREFIX)] = work["id"]
+            id_mapping.update(batch_mapping)
+            if cache is not None:
+                cache.set_many("doi", batch_mapping)
     return id_mapping
 
 
+class _Checkpoint:
+    """Sidecar files with the results of the records that are already snowballed.
+
+    Every line of the checkpoint file contains the identifiers of the works found for
+    a chunk of records for one direction of snowballing, so that an interrupted run
+    can be resumed. The works are stored once in an SQLite database next to it, also
+    when they are found for many records, and are only read back from it when
+    resuming. If the path is None, no files are written.
+    """
+
+    def __init__(self, path: Path | None, resume: bool = False):
+        self.path = path
+        self.works_path = path.with_suffix(".works.sqlite") if path else None
+        self.identifiers = {"forward": set(), "backward": set()}
+        self.work_ids = {"forward": {}, "backward": {}}
+        self._stored_ids = set()
+
+        if path is None:
+            self._file = None
+            self._conn = None
+            return
+
+        if resume and path.exists():
+            with open(path, "r+b") as f:
+                n_bytes = 0
+                for line in f:
+                    # The last line is incomplete if the run was interrupted while
+                    # writing it.
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        chunk = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    self.identifiers[chunk["direction"]].update(chunk["identifiers"])
+                    self.work_ids[chunk["direction"]].update(chunk["works"])
+                    n_bytes += len(line)
+                # Remove the incomplete line, so that the chunks written after
+                # resuming are read back when resuming again.
+                f.truncate(n_bytes)
+            print(
+                f"Resuming from checkpoint {path}:"
+                f" {len(self.identifiers['forward'])} records with forward and"
+                f" {len(self.identifiers['backward'])} records with backward"
+                " snowballing already done."
+            )
+            self._file = open(path, "a")
+        else:
+            if resume:
+                print(f"No checkpoint found at {path}, starting from the beginning.")
+            self._file = open(path, "w")
+            self.works_path.unlink(missing_ok=True)
+
+        self._conn = sqlite3.connect(self.works_path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS works"
+            " (id TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def add(self, direction: str, identifiers: list[str], works: dict) -> None:
+        self.identifiers[direction].update(identifiers)
+        if self._file is None:
+            return
+
+        # The works are committed before the checkpoint line that refers to them.
+        new_works = {}
+        for works_list in works.values():
+            for work in works_list:
+                if work["id"] not in self._stored_ids:
+                    new_works[work["id"]] = json.dumps(work)
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO works VALUES (?, ?)", new_works.items()
+        )
+        self._conn.commit()
+        self._stored_ids.update(new_works)
+
+        work_ids = {
+            identifier: [work["id"] for work in works_list]
+            for identifier, works_list in works.items()
+        }
+        chunk = {"direction": direction, "identifiers": identifiers, "works": work_ids}
+        self._file.write(json.dumps(chunk) + "\n")
+        self._file.flush()
+
+    def _get_works(self, work_ids: list[str]) -> dict[str, dict]:
+        works = {}
+        for i in range(0, len(work_ids), SQLITE_MAX_VARIABLES):
+            batch = work_ids[i : i + SQLITE_MAX_VARIABLES]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT id, value FROM works WHERE id IN ({placeholders})", batch
+            )
+            works.update((work_id, json.loads(value)) for work_id, value in rows)
+        return works
+
+    def done_results(
+        self, direction: str, identifiers: list[str], chunk_size: int
+    ) -> Iterator[dict[str, list[dict]]]:
+        """Yield the results of the records snowballed before resuming, in chunks.
+
+        The works of a chunk are read from the works database, so that only the
+        works of one chunk are kept in memory.
+        """
+        done_ids = self.work_ids[direction]
+        done = [i for i in dict.fromkeys(identifiers) if i in done_ids]
+        for start in range(0, len(done), chunk_size):
+            chunk_ids = {i: done_ids.pop(i) for i in done[start : start + chunk_size]}
+            works = self._get_works(
+                list({w for work_ids in chunk_ids.values() for w in work_ids})
+            )
+            yield {i: [works[w] for w in work_ids] for i, work_ids in chunk_ids.items()}
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._conn.close()
+            self._file = None
+
+    def remove(self) -> None:
+        self.close()
+        if self.path is not None:
+            self.path.unlink()
+            self.works_path.unlink(missing_ok=True)
+
+
+def _snowball_with_checkpoint(
+    snowball_function,
+    direction: str,
+    identifiers: list[str],
+    checkpoint: _Checkpoint,
+    chunk_size: int,
+    **kwargs,
+) -> Iterator[tuple[str, dict[str, list[dict]]]]:
+    # Yield the results of the records that were done before resuming, then snowball
+    # the other records in chunks and write the results of every chunk to the
+    # checkpoint. The results are yielded together with the direction.
+    for done_results in checkpoint.done_results(direction, identifiers, chunk_size):
+        yield direction, done_results
+
+    identifiers = [i for i in identifiers if i not in checkpoint.identifiers[direction]]
+    for i in range(0, len(identifiers), chunk_size):
+        chunk = identifiers[i : i + chunk_size]
+        chunk_results = snowball_function(chunk, **kwargs)
+        checkpoint.add(direction, chunk, chunk_results)
+        yield direction, chunk_results
+
+
+def _unique_works(results: dict[str, list[dict]], found: set[str]) -> Iterator[dict]:
+    # Yield the works in the snowballing results that are not in 'found' yet.
+    for works_list in results.values():
+        for work in works_list:
+            if work["id"] not in found:
+                found.add(work["id"])
+                yield work
+
+
+def _keep_work(
+    work: dict, min_publication_date: str | None, min_citations: int | None
+) -> bool:
+    if min_publication_date is not None and (
+        work["publication_date"] is None
+        or work["publication_date"] < min_publication_date
+    ):
+        return False
+    if min_citations is not None and (work["cited_by_count"] or 0) < min_citations:
+        return False
+    return True
+
+
+class _CitationGraph:
+    """Citation edges between works, with the works encoded as integers."""
+
+    def __init__(self):
+        self.node_ids = {}
+        self.sources = array.array("q")
+        self.targets = array.array("q")
+
+    def _node_id(self, openalex_id: str) -> int:
+        return self.node_ids.setdefault(openalex_id, len(self.node_ids))
+
+    def add_results(
+        self,
+        direction: str,
+        results: dict[str, list[dict]],
+        min_publication_date: str | None = None,
+        min_citations: int | None = None,
+    ) -> None:
+        for identifier, works_list in results.items():
+            for work in works_list:
+                if not _keep_work(work, min_publication_date, min_citations):
+                    continue
+                if direction == "forward":
+                    self.sources.append(self._node_id(work["id"]))
+                    self.targets.append(self._node_id(identifier))
+                else:
+                    self.sources.append(self._node_id(identifier))
+                    self.targets.append(self._node_id(work["id"]))
+
+    def to_files(self, edges_path: Path, nodes_path: Path) -> None:
+        # A citation can be found in both directions, so the edges are deduplicated.
+        edges = pd.DataFrame(
+            {
+                "source": np.frombuffer(self.sources, dtype=np.int64),
+                "target": np.frombuffer(self.targets, dtype=np.int64),
+            }
+        ).drop_duplicates()
+        nodes = pd.DataFrame(
+            {"node_id": self.node_ids.values(), "openalex_id": self.node_ids.keys()}
+        )
+        for df, path in [(edges, edges_path), (nodes, nodes_path)]:
+            if path.suffix == ".parquet":
+                df.to_parquet(path, index=False)
+            else:
+                df.to_csv(path, index=False)
+
+
+def _check_date_arg(date):
+    # raises a ValueError if the date is not in the format YYYY-MM-DD
+    return datetime.date.fromisoformat(date).isoformat()
+
+
 def snowball(
     input_path: Path,
-    output_path: Path,
+    output_path: Path | None,
     forward: bool,
     backward: bool,
     use_all: bool = False,
     email: str = None,
-) -> None:
+    workers: int = 1,
+    rate_limit: float | None = DEFAULT_RATE_LIMIT,
+    cache_dir: Path | None = None,
+    refresh: bool = False,
+    resume: bool = False,
+    depth: int = 1,
+    min_publication_date: str | None = None,
+    min_citations: int | None = None,
+    graph_format: str | None = None,
+) -> pd.DataFrame | None:
     """Perform snowballing on an ASReview dataset.
 
     Parameters
     ----------
     input_path : Path
-        Location of the input ASReview dataset.
-    output_path : Path
-        Location where to save the output dataset.
+        Location of the input ASReview dataset, or the loaded dataset.
+    output_path : Path | None
+        Location where to save the output dataset. If None, the works are returned
+        instead, without a checkpoint file.
     forward : bool
         Perform forward snowballing. At least one of `forward` or `backward` should be
         True.
@@ -199,6 +663,45 @@ def snowball(
         records, by default False
     email : str, optional
         Email address to send along with request to OpenAlex, by default None
+    workers : int, optional
+        Number of parallel workers used for looking up DOIs and for forward
+        snowballing, by default 1
+    rate_limit : float | None, optional
+        Maximum number of requests per second sent to OpenAlex. The rate is lowered
+        automatically when OpenAlex responds that too many requests are sent. By
+        default DEFAULT_RATE_LIMIT, the limit of the OpenAlex polite pool. 0 or None
+        means no limit.
+    cache_dir : Path | None, optional
+        Directory of the cache of OpenAlex responses. Only works, references and
+        DOIs that are not in the cache are requested from OpenAlex. By default None,
+        meaning that no cache is used.
+    refresh : bool, optional
+        Request everything from OpenAlex again and update the cache with the new
+        responses, by default False
+    resume : bool, optional
+        Resume an interrupted run from its checkpoint file next to the output
+        dataset, skipping the records that were already snowballed, by default False
+    depth : int, optional
+        Number of snowballing hops. Every hop snowballs the works found in the
+        previous hop that were not snowballed before, by default 1
+    min_publication_date : str | None, optional
+        Only keep and snowball further the works published on or after this date
+        (YYYY-MM-DD), by default None
+    min_citations : int | None, optional
+        Only keep and snowball further the works cited at least this number of
+        times, by default None
+    graph_format : str | None, optional
+        Also write the citation graph found while snowballing, in this format ('csv'
+        or 'parquet'). The edges are written to `<output name>_edges.<format>` with
+        the columns `source` and `target`, meaning that the work `source` cites the
+        work `target`. The works are encoded as integers, the table
+        `<output name>_nodes.<format>` maps them to OpenAlex identifiers. By default
+        None, meaning that no citation graph is written.
+
+    Returns
+    -------
+    pandas.DataFrame | None
+        The works found by snowballing if `output_path` is None.
 
     Raises
     ------
@@ -209,67 +712,163 @@ def snowball(
     """
     if not (forward or backward):
         raise ValueError("At least one of 'forward' or 'backward' should be True.")
+    if depth < 1:
+        raise ValueError("The snowballing depth should be at least 1.")
+    if output_path is None and graph_format is not None:
+        raise ValueError("The citation graph can only be written with an output path.")
 
-    data = load_data(input_path)
+    data = read_data(input_path, columns=INPUT_COLUMNS)
     if use_all or (data.included is None):
         data = data.df
     else:
         data = data.df.loc[data.included.astype(bool)]
 
-    # Add OpenAlex identifiers if not available.
-    if "openalex_id" not in data.columns:
-        if "doi" not in data.columns:
-            raise ValueError(
-                "Dataset should contain a column 'openalex_id' containing OpenAlex"
-                " identifiers or a column 'doi' containing DOIs."
-            )
-        id_mapping = openalex_from_doi(data.doi.dropna().to_list())
-        n_openalex_ids = len(
-            [
-                openalex_id
-                for openalex_id in id_mapping.values()
-                if openalex_id is not None
-            ]
-        )
-        print(
-            f"Found OpenAlex identifiers for {n_openalex_ids} out of {len(data)}"
-            " records. Performing snowballing for those records."
-        )
-        data["openalex_id"] = None
-        data.loc[data.doi.notna(), "openalex_id"] = (
-            data.loc[data.doi.notna(), "doi"]
-            .str.removeprefix(DOI_PREFIX)
-            .apply(lambda doi: id_mapping[doi])
-        )
-
-    identifiers = data["openalex_id"].dropna().to_list()
-
     if email is not None:
         pyalex.config.email = email
 
-    if forward:
-        print("Starting forward snowballing")
-        forward_data = forward_snowballing(identifiers)
-    else:
-        forward_data = {}
-    if backward:
-        print("Starting backward snowballing")
-        backward_data = backward_snowballing(identifiers)
+    if cache_dir is not None:
+        cache_context = OpenAlexCache(cache_dir, refresh=refresh)
     else:
-        backward_data = {}
-
-    all_works = []
-    for works_list in forward_data.values():
-        all_works += works_list
-    for works_list in backward_data.values():
-        all_works += works_list
+        cache_context = contextlib.nullcontext()
+
+    client = OpenAlexClient(requests_per_second=rate_limit)
+
+    with cache_context as cache:
+        # Add OpenAlex identifiers for the records that do not have one yet.
+        if "openalex_id" not in data.columns:
+            if "doi" not in data.columns:
+                raise ValueError(
+                    "Dataset should contain a column 'openalex_id' containing OpenAlex"
+                    " identifiers or a column 'doi' containing DOIs."
+                )
+            data["openalex_id"] = None
+        if "doi" in data.columns:
+            missing_id = data["openalex_id"].isna() & data["doi"].notna()
+        else:
+            missing_id = pd.Series(False, index=data.index)
+        if missing_id.any():
+            dois = data.loc[missing_id, "doi"].map(normalize_doi)
+            id_mapping = openalex_from_doi(
+                dois.dropna().to_list(), workers=workers, client=client, cache=cache
+            )
+            data.loc[missing_id, "openalex_id"] = dois.map(id_mapping)
+            n_found = data.loc[missing_id, "openalex_id"].notna().sum()
+            print(
+                f"Found OpenAlex identifiers for {n_found} out of"
+                f" {missing_id.sum()} records without an OpenAlex identifier."
+                f" Performing snowballing for {data['openalex_id'].notna().sum()} out"
+                f" of {len(data)} records."
+            )
 
-    output_data = pd.DataFrame(all_works)
-    output_data.drop_duplicates(subset=["id"], inplace=True)
-    output_data.rename({"id": "openalex_id"}, axis=1, inplace=True)
-    output_data = ASReviewData(output_data)
-    output_data.to_file(output_path)
-    print("Saved dataset")
+        identifiers = data["openalex_id"].dropna().to_list()
+
+        # The results are written to a checkpoint regularly, so that an interrupted
+        # run can be resumed.
+        if output_path is not None:
+            checkpoint = _Checkpoint(Path(f"{output_path}.checkpoint.jsonl"), resume)
+        else:
+            checkpoint = _Checkpoint(None)
+        chunk_size = max(CHECKPOINT_INTERVAL, OPENALEX_MAX_OR_LENGTH * workers)
+        # Every hop snowballs the frontier of works found in the previous hop that
+        # were not visited before. The works are deduplicated while they are
+        # fetched and written to the output file chunk by chunk, so that only the
+        # identifiers of the works have to be kept in memory.
+        visited = set(identifiers)
+        written = set()
+        frontier = list(dict.fromkeys(identifiers))
+        writer = ChunkedWriter(output_path)
+        graph = _CitationGraph() if graph_format is not None else None
+        try:
+            for hop in range(1, depth + 1):
+                if not frontier:
+                    break
+
+                hop_chunks = []
+                if forward:
+                    print(f"Starting forward snowballing (hop {hop})")
+                    hop_chunks.append(
+                        _snowball_with_checkpoint(
+                            forward_snowballing,
+                            "forward",
+                            frontier,
+                            checkpoint,
+                            chunk_size,
+                            workers=workers,
+                            client=client,
+                            cache=cache,
+                        )
+                    )
+                if backward:
+                    print(f"Starting backward snowballing (hop {hop})")
+                    hop_chunks.append(
+                        _snowball_with_checkpoint(
+                            backward_snowballing,
+                            "backward",
+                            frontier,
+                            checkpoint,
+                            chunk_size,
+                            client=client,
+                            cache=cache,
+                        )
+                    )
+
+                found, n_kept = set(), 0
+                next_frontier = []
+                for direction, chunk_results in itertools.chain(*hop_chunks):
+                    if graph is not None:
+                        graph.add_results(
+                            direction,
+                            chunk_results,
+                            min_publication_date,
+                            min_citations,
+                        )
+                    new_works = []
+                    for work in _unique_works(chunk_results, found):
+                        if not _keep_work(work, min_publication_date, min_citations):
+                            continue
+                        n_kept += 1
+                        if work["id"] not in written:
+                            written.add(work["id"])
+                            new_works.append(work)
+                        if work["id"] not in visited:
+                            visited.add(work["id"])
+                            next_frontier.append(work["id"])
+                    writer.write(
+                        pd.DataFrame(new_works, columns=OUTPUT_FIELDS).rename(
+                            columns={"id": "openalex_id"}
+                        )
+                    )
+
+                print(
+                    f"Hop {hop}: snowballed {len(frontier)} records, found {len(found)}"
+                    f" works, kept {n_kept} works of which {len(next_frontier)}"
+                    " were not seen before."
+                )
+                frontier = next_frontier
+        except BaseException:
+            checkpoint.close()
+            if checkpoint.path is not None:
+                print(
+                    "Snowballing was interrupted. Use --resume to continue from the"
+                    f" checkpoint {checkpoint.path}."
+                )
+            raise
+        finally:
+            writer.close()
+            print(client.summary())
+
+    checkpoint.remove()
+    if output_path is None:
+        print(f"Found {len(written)} records")
+        return writer.df
+    print(f"Saved dataset with {len(written)} records")
+
+    if graph is not None:
+        output_path = Path(output_path)
+        edges_path = output_path.with_name(f"{output_path.stem}_edges.{graph_format}")
+        nodes_path = output_path.with_name(f"{output_path.stem}_nodes.{graph_format}")
+        graph.to_files(edges_path, nodes_path)
+        print(f"Saved citation graph to {edges_path} and {nodes_path}")
 
 
 def _parse_arguments_snowball():
@@ -306,4 +905,96 @@ def _parse_arguments_snowball():
             "https://docs.openalex.org/how-to-use-the-api/rate-limits-and-authentication#the-polite-pool"
         ),
     )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=1,
+        help=(
+            "Number of parallel workers used for looking up DOIs and for forward"
+            " snowballing. Default: 1."
+        ),
+    )
+    parser.add_argument(
+        "--rate-limit",
+        dest="rate_limit",
+        type=float,
+        default=DEFAULT_RATE_LIMIT,
+        help=(
+            "Maximum number of requests per second sent to OpenAlex, 0 for no"
+            f" limit. Default: {DEFAULT_RATE_LIMIT}, the limit of the OpenAlex"
+            " polite pool."
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help=(
+            "Directory of the cache of OpenAlex responses. Reruns only request"
+            f" records that are not in the cache. Default: {DEFAULT_CACHE_DIR}."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="cache_dir",
+        action="store_const",
+        const=None,
+        help="Do not read from or write to the cache of OpenAlex responses.",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore the cached OpenAlex responses and update the cache.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "Resume an interrupted run from the checkpoint next to the output file,"
+            " skipping the records that were already snowballed."
+        ),
+    )
+    parser.add_argument(
+        "--depth",
+        "-d",
+        type=int,
+        default=1,
+        help=(
+            "Number of snowballing hops. Every hop snowballs the new works found in"
+            " the previous hop. Default: 1."
+        ),
+    )
+    parser.add_argument(
+        "--min-publication-date",
+        dest="min_publication_date",
+        type=_check_date_arg,
+        default=None,
+        help=(
+            "Only keep and snowball further the works published on or after this"
+            " date (YYYY-MM-DD)."
+        ),
+    )
+    parser.add_argument(
+        "--min-citations",
+        dest="min_citations",
+        type=int,
+        default=None,
+        help="Only keep and snowball further the works cited at least this often.",
+    )
+    parser.add_argument(
+        "--graph",
+        dest="graph_format",
+        nargs="?",
+        const="csv",
+        default=None,
+        choices=["csv", "parquet"],
+        help=(
+            "Also write the citation graph next to the output dataset, as an edge"
+            " list of integer node ids (<output name>_edges.csv) and a table mapping"
+            " the node ids to OpenAlex identifiers (<output name>_nodes.csv). Pass"
+            " 'parquet' to write Parquet files instead (requires pyarrow)."
+        ),
+    )
     return parser
@@ -3,7 +3,15 @@ from pathlib import Path
 
 import pandas as pd
 from asreview import ASReviewData
-from asreview.data.base import load_data
+
+from asreviewcontrib.datatools.io import SUFFIXES_COLUMNAR
+from asreviewcontrib.datatools.io import SUFFIXES_RIS
+from asreviewcontrib.datatools.io import SUFFIXES_TABULAR_SEP
+from asreviewcontrib.datatools.io import ChunkedWriter
+from asreviewcontrib.datatools.io import iter_chunks
+from asreviewcontrib.datatools.io import load_datasets
+from asreviewcontrib.datatools.io import read_columns
+from asreviewcontrib.datatools.io import write_data
 
 
 def _check_suffix(input_files, output_file):
@@ -12,7 +20,7 @@ def _check_suffix(input_files, output_file):
     suffixes.append(Path(output_file).suffix)
 
     set_ris = {".txt", ".ris"}
-    set_tabular = {".csv", ".tab", ".tsv", ".xlsx"}
+    set_tabular = {".csv", ".tab", ".tsv", ".xlsx", *SUFFIXES_COLUMNAR}
     set_suffixes = set(suffixes)
 
     if len(set(suffixes)) > 1:
@@ -23,14 +31,63 @@ def _check_suffix(input_files, output_file):
             )
 
 
-def vstack(output_file, input_files):
-    _check_suffix(input_files, output_file)
+def _vstack_chunked(output_file, input_files, chunk_size):
+    suffixes = {Path(item).suffix for item in input_files}
+    if not suffixes.issubset(
+        SUFFIXES_RIS | set(SUFFIXES_TABULAR_SEP) | set(SUFFIXES_COLUMNAR)
+    ):
+        raise ValueError(
+            "• Stacking in chunks is only supported for CSV, TSV, RIS, Parquet and"
+            " Feather input files."
+        )
+
+    # Every chunk is aligned with the union of the columns of all input files,
+    # which is read from their headers. RIS records are written one by one and
+    # leave out empty fields, so they do not need a common set of columns.
+    columns = None
+    if Path(output_file).suffix in SUFFIXES_TABULAR_SEP:
+        columns = list(
+            dict.fromkeys(
+                column for item in input_files for column in read_columns(item)
+            )
+        )
+
+    with ChunkedWriter(output_file) as writer:
+        for item in input_files:
+            for df in iter_chunks(item, chunk_size):
+                if columns is not None:
+                    df = df.reindex(columns=columns)
+                writer.write(df)
 
-    list_dfs = [load_data(item).df for item in input_files]
+
+def stack_datasets(datasets) -> ASReviewData:
+    """Stack datasets vertically.
+
+    Parameters
+    ----------
+    datasets : list[ASReviewData]
+        The datasets, in the order in which they are stacked.
+
+    Returns
+    -------
+    ASReviewData
+        The stacked dataset, with the records numbered from 0.
+    """
+    list_dfs = [as_data.df for as_data in datasets]
     df_vstacked = pd.concat(list_dfs).reset_index(drop=True)
-    as_vstacked = ASReviewData(df=df_vstacked)
+    return ASReviewData(df=df_vstacked)
 
-    as_vstacked.to_file(output_file)
+
+def vstack(output_file, input_files, chunk_size=None, jobs=1):
+    _check_suffix(input_files, output_file)
+
+    if chunk_size is not None:
+        _vstack_chunked(output_file, input_files, chunk_size)
+        return
+
+    as_vstacked = stack_datasets(load_datasets(input_files, jobs=jobs))
+
+    write_data(as_vstacked, output_file)
 
 
 def _parse_arguments_vstack():
@@ -42,5 +99,26 @@ def _parse_arguments_vstack():
         nargs="+",
         help="Any number of datasets to stack vertically.",
     )
+    parser.add_argument(
+        "--chunk-size",
+        dest="chunk_size",
+        type=int,
+        default=None,
+        help=(
+            "Stack the datasets in chunks of this number of records, so that only"
+            " one chunk is kept in memory. Only for CSV, TSV, RIS, Parquet and"
+            " Feather files. By default, all datasets are loaded into memory at once."
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help=(
+            "Number of processes parsing the datasets in parallel. Not used with"
+            " --chunk-size. Default: 1."
+        ),
+    )
 
     return parser
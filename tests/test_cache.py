@@ -0,0 +1,44 @@
+from asreviewcontrib.datatools.cache import OpenAlexCache
+
+
+def test_cache_get_set(tmpdir):
+    with OpenAlexCache(tmpdir) as cache:
+        cache.set_many(
+            "doi", {"10.1042/cs20220150": "https://openalex.org/W4386305682"}
+        )
+        cache.set_many("doi", {"not_a_doi": None})
+
+        assert cache.get_many("doi", ["10.1042/cs20220150", "not_a_doi", "other"]) == {
+            "10.1042/cs20220150": "https://openalex.org/W4386305682",
+            "not_a_doi": None,
+        }
+        assert cache.get_many("work", ["10.1042/cs20220150"]) == {}
+
+    # The responses are persisted on disk.
+    with OpenAlexCache(tmpdir) as cache:
+        assert cache.get_many("doi", ["not_a_doi"]) == {"not_a_doi": None}
+
+
+def test_cache_refresh(tmpdir):
+    with OpenAlexCache(tmpdir) as cache:
+        cache.set_many("references", {"W1": ["W2", "W3"]})
+
+    with OpenAlexCache(tmpdir, refresh=True) as cache:
+        assert cache.get_many("references", ["W1"]) == {}
+
+
+def test_cache_ttl(tmpdir):
+    with OpenAlexCache(tmpdir, ttl=0) as cache:
+        cache.set_many("references", {"W1": ["W2", "W3"]})
+        assert cache.get_many("references", ["W1"]) == {}
+
+
+def test_cache_eviction(tmpdir):
+    with OpenAlexCache(tmpdir, max_size=100) as cache:
+        cache.set_many("work", {"W1": {"title": "a" * 60}})
+        cache.set_many("work", {"W2": {"title": "b" * 60}})
+        cache.get_many("work", ["W1"])
+
+    # Only the most recently used response fits in the cache.
+    with OpenAlexCache(tmpdir) as cache:
+        assert list(cache.get_many("work", ["W1", "W2"])) == ["W1"]
@@ -1,11 +1,18 @@
+import time
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
 import pytest
+from asreview import ASReviewData
 
 from asreviewcontrib.datatools.compose import _check_order_arg
 from asreviewcontrib.datatools.compose import _check_resolve_arg
 from asreviewcontrib.datatools.compose import _check_suffix
+from asreviewcontrib.datatools.compose import _output_composition
+from asreviewcontrib.datatools.compose import compose
 from asreviewcontrib.datatools.compose import create_composition
+from asreviewcontrib.datatools.compose import update_composition
 
 parent_dir = Path(__file__).parent
 file_1 = Path(parent_dir, "demo_data", "dataset_1.ris")
@@ -60,3 +67,160 @@ def test_label_prioritization():
     df_4 = create_composition(*input_files_2, order="riu")
     df_4_counts = df_4["included"].value_counts()
     assert df_4_counts[-1] == 7 and df_4_counts[0] == 3 and df_4_counts[1] == 1
+
+
+def test_composition_jobs():
+    # parsing the input files in parallel gives the same composition
+    df_serial = create_composition(*input_files_2, order="riu")
+    df_parallel = create_composition(*input_files_2, order="riu", jobs=2)
+    pd.testing.assert_frame_equal(df_serial, df_parallel)
+
+
+def test_composition_merge():
+    # merging keeps the same records as dropping duplicates
+    df_drop = create_composition(*input_files_2, order="riu")
+    df_merge = create_composition(*input_files_2, order="riu", merge=True)
+    assert df_merge["title"].to_list() == df_drop["title"].to_list()
+    assert df_merge["included"].to_list() == df_drop["included"].to_list()
+
+
+def test_composition_multiple_pids(tmpdir):
+    # records linked by any of the identifiers are duplicates
+    path_rel = Path(tmpdir, "relevant.csv")
+    path_unl = Path(tmpdir, "unlabeled.csv")
+    pd.DataFrame({"title": ["A"], "doi": ["10.1/a"], "pmid": [1]}).to_csv(
+        path_rel, index=False
+    )
+    pd.DataFrame({"title": ["B", "C"], "doi": [None, "10.1/c"], "pmid": [1, 2]}).to_csv(
+        path_unl, index=False
+    )
+
+    df_doi = create_composition(path_rel, None, None, path_unl, pid="doi")
+    assert df_doi["title"].to_list() == ["A", "B", "C"]
+
+    df_pids = create_composition(path_rel, None, None, path_unl, pid=["doi", "pmid"])
+    assert df_pids["title"].to_list() == ["A", "C"]
+    assert df_pids["included"].to_list() == [1, -1]
+
+
+def test_composition_multiple_pids_chain(tmpdir):
+    # a record with a DOI, a record with a PMID and a record with both are one
+    # cluster, of which the first record is kept
+    path_unl = Path(tmpdir, "unlabeled.csv")
+    pd.DataFrame(
+        {
+            "title": ["A", "B", "C", "D"],
+            "doi": ["10.1/a", None, "10.1/a", None],
+            "pmid": [None, 1, 1, 2],
+        }
+    ).to_csv(path_unl, index=False)
+
+    output_path = Path(tmpdir, "composed.csv")
+    compose(output_path, None, None, None, path_unl, pid=["doi", "pmid"])
+    assert pd.read_csv(output_path)["title"].to_list() == ["A", "D"]
+
+    df_doi = create_composition(None, None, None, path_unl, pid="doi")
+    assert df_doi["title"].to_list() == ["A", "B", "D"]
+
+
+def test_composition_label_duplicates_first(tmpdir):
+    # duplicates with the same label are removed before checking for conflicts,
+    # so a removed duplicate does not link records with different labels
+    path_rel = Path(tmpdir, "relevant.csv")
+    path_unl = Path(tmpdir, "unlabeled.csv")
+    pd.DataFrame({"title": ["A", "B"], "doi": ["10.1/a", "10.1/a"]}).to_csv(
+        path_rel, index=False
+    )
+    pd.DataFrame({"title": ["B", "A"], "doi": [None, None]}).to_csv(
+        path_unl, index=False
+    )
+
+    df_keep_one = create_composition(path_rel, None, None, path_unl, order="uri")
+    assert df_keep_one["title"].to_list() == ["B", "A"]
+    assert df_keep_one["included"].to_list() == [-1, -1]
+
+    df_keep_all = create_composition(
+        path_rel, None, None, path_unl, order="riu", resolve="keep_all"
+    )
+    assert df_keep_all["title"].to_list() == ["A", "B", "A"]
+    assert df_keep_all["included"].to_list() == [1, -1, -1]
+
+
+def test_update_composition(tmpdir):
+    path_base = Path(tmpdir, "composed.ris")
+    compose(path_base, None, None, file_1, None)
+
+    # adding a dataset gives the same records and labels as composing from scratch
+    df_update = update_composition(path_base, None, None, None, file_2, order="riu")
+    df_full = create_composition(*input_files_2, order="riu")
+    assert sorted(zip(df_update["title"], df_update["included"])) == sorted(
+        zip(df_full["title"], df_full["included"])
+    )
+
+    # the existing records are updated in place with the new labels
+    df_relevant = update_composition(path_base, file_1, None, None, None)
+    df_base = create_composition(None, None, file_1, None)
+    assert df_relevant["title"].to_list() == df_base["title"].to_list()
+    assert (df_relevant["included"] == 1).all()
+
+
+def test_update_composition_csv(tmpdir):
+    # the record numbers of a CSV base are not added as columns with every update
+    input_paths = []
+    for item in [file_1, file_2]:
+        input_paths.append(Path(tmpdir, item.with_suffix(".csv").name))
+        ASReviewData.from_file(item).to_file(input_paths[-1])
+
+    path_base = Path(tmpdir, "composed_0.csv")
+    compose(path_base, None, None, input_paths[0], None)
+    path_update_1 = Path(tmpdir, "composed_1.csv")
+    compose(path_update_1, None, None, None, input_paths[1], base=path_base)
+    path_update_2 = Path(tmpdir, "composed_2.csv")
+    compose(path_update_2, input_paths[0], None, None, None, base=path_update_1)
+
+    df_update = pd.read_csv(path_update_2, index_col=0)
+    assert list(df_update.columns) == list(
+        pd.read_csv(path_update_1, index_col=0).columns
+    )
+    assert not df_update.columns.str.startswith("Unnamed").any()
+
+    # the chained increments give the same records and labels as a full compose
+    path_full = Path(tmpdir, "composed_full.csv")
+    compose(path_full, input_paths[0], None, input_paths[0], input_paths[1])
+    df_full = pd.read_csv(path_full, index_col=0)
+    assert sorted(zip(df_update["title"], df_update["included"].fillna(-1))) == (
+        sorted(zip(df_full["title"], df_full["included"].fillna(-1)))
+    )
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("n_records", [10_000, 100_000])
+def test_output_composition_benchmark(tmpdir, n_records):
+    rng = np.random.default_rng(535)
+    df = pd.DataFrame(
+        {
+            "title": [f"Title {i}" for i in range(n_records)],
+            "abstract": [f"Abstract {i}" for i in range(n_records)],
+            "included": rng.choice([-1, 0, 1], size=n_records),
+        }
+    )
+    output_path = Path(tmpdir, "composed.csv")
+
+    start = time.perf_counter()
+    _output_composition(df, output_path)
+    duration = time.perf_counter() - start
+
+    # the reference is the previous implementation, which collected the labels with
+    # iterrows before writing the dataset
+    start = time.perf_counter()
+    labels = [[index, row["included"]] for index, row in df.iloc[:10_000].iterrows()]
+    ASReviewData(df=df.iloc[:10_000]).to_file(Path(tmpdir, "ref.csv"), labels=labels)
+    reference_duration = (time.perf_counter() - start) * n_records / 10_000
+    print(
+        f"Writing a composition of {n_records} records: {duration:.2f}s, estimated"
+        f" {reference_duration:.2f}s with iterrows"
+    )
+
+    df_output = pd.read_csv(output_path)
+    assert df_output["included"].fillna(-1).to_list() == df["included"].to_list()
+    assert df_output["included"].isna().sum() == (df["included"] == -1).sum()
@@ -0,0 +1,245 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from asreview import ASReviewData
+from asreview.data import load_data
+
+from asreviewcontrib.datatools.dedup import LSH_RECALL
+from asreviewcontrib.datatools.dedup import _bucket_links
+from asreviewcontrib.datatools.dedup import _connected_components
+from asreviewcontrib.datatools.dedup import _lsh_params
+from asreviewcontrib.datatools.dedup import _lsh_recall
+from asreviewcontrib.datatools.dedup import dedup
+from asreviewcontrib.datatools.dedup import duplicate_report
+from asreviewcontrib.datatools.dedup import duplicated
+from asreviewcontrib.datatools.dedup import find_duplicates
+from asreviewcontrib.datatools.dedup import merge_duplicates
+from asreviewcontrib.datatools.dedup import minhash_signatures
+from asreviewcontrib.datatools.describe import describe_statistics
+from asreviewcontrib.datatools.stack import vstack
+
+test_dir = Path(__file__).parent
+file_1 = Path(test_dir, "demo_data", "dataset_1.ris")
+file_2 = Path(test_dir, "demo_data", "dataset_2.ris")
+
+abstract = (
+    "Background: the optimal duration of chemotherapy in metastatic colorectal"
+    " cancer is not well established. This study investigated the efficacy of"
+    " maintenance treatment versus observation in patients not progressing during"
+    " induction treatment."
+)
+df_near_duplicates = pd.DataFrame(
+    {
+        "title": ["Maintenance treatment", "Maintenance treatment", "Other title"],
+        "abstract": [
+            abstract,
+            abstract.replace("optimal", "optimall") + " Copyright 2013.",
+            "An unrelated abstract about something else entirely.",
+        ],
+        "doi": [None, None, "10.1/a"],
+    }
+)
+
+
+def test_find_duplicates_exact(tmpdir):
+    # without a threshold, the same records are duplicates as with ASReviewData
+    stacked_path = Path(tmpdir, "stacked.ris")
+    vstack(stacked_path, [file_1, file_2, file_1])
+    asdata = load_data(stacked_path)
+
+    df_clusters = find_duplicates(asdata)
+    is_duplicate = np.zeros(len(asdata), dtype=bool)
+    is_duplicate[df_clusters["record"]] = (
+        df_clusters["record"] != df_clusters["cluster"]
+    )
+
+    np.testing.assert_array_equal(is_duplicate, asdata.duplicated("doi"))
+    assert set(df_clusters["reason"]) == {"doi", "text"}
+    assert (df_clusters["score"] == 1).all()
+
+
+def test_find_duplicates_similar():
+    asdata = ASReviewData(df_near_duplicates)
+    assert len(find_duplicates(asdata)) == 0
+
+    df_clusters = find_duplicates(asdata, threshold=0.6)
+    assert df_clusters["record"].to_list() == [0, 1]
+    assert df_clusters["cluster"].to_list() == [0, 0]
+    assert (df_clusters["reason"] == "similar text").all()
+    assert (df_clusters["score"] >= 0.6).all()
+
+
+def test_find_duplicates_multiple_pids():
+    df = pd.DataFrame(
+        {
+            "title": ["A", "B", "C", "D"],
+            "doi": ["10.1/a", None, "10.1/a", None],
+            "pmid": [None, 1, 1, 2],
+        }
+    )
+    asdata = ASReviewData(df)
+
+    # records 0 and 2 share a DOI, records 1 and 2 a PubMed identifier
+    df_clusters = find_duplicates(asdata, pid=["doi", "pmid", "openalex_id"])
+    assert df_clusters["record"].to_list() == [0, 1, 2]
+    assert df_clusters["cluster"].to_list() == [0, 0, 0]
+    assert df_clusters["reason"].to_list() == ["doi", "pmid", "doi"]
+
+    assert len(find_duplicates(asdata, pid="doi")) == 2
+
+
+def test_dedup_multiple_pids(tmpdir):
+    # a record with a DOI, a record with a PMID and a record with both are one
+    # cluster
+    input_path = Path(tmpdir, "input.csv")
+    pd.DataFrame(
+        {
+            "title": ["A", "B", "C", "D"],
+            "doi": ["10.1/a", None, "10.1/a", None],
+            "pmid": [None, 1, 1, 2],
+        }
+    ).to_csv(input_path, index=False)
+    output_path = Path(tmpdir, "output.csv")
+    clusters_path = Path(tmpdir, "clusters.csv")
+
+    dedup(input_path, output_path, pid=["doi", "pmid"], clusters_path=clusters_path)
+    assert load_data(output_path).df["title"].to_list() == ["A", "D"]
+    assert pd.read_csv(clusters_path)["cluster"].to_list() == [0, 0, 0]
+
+
+def test_find_duplicates_chain():
+    # record 2 has the DOI of record 0 and the text of record 1, which is not a
+    # duplicate of record 0
+    asdata = ASReviewData(
+        pd.DataFrame({"title": ["A", "B", "B"], "doi": ["10.1/a", "10.1/b", "10.1/a"]})
+    )
+    is_duplicate = duplicated(find_duplicates(asdata), len(asdata))
+    np.testing.assert_array_equal(is_duplicate, asdata.duplicated("doi"))
+    assert is_duplicate.tolist() == [False, False, True]
+
+    # the same number of duplicates as described
+    stats = {item["id"]: item["value"] for item in describe_statistics(asdata)}
+    assert stats["n_duplicates"] == 1
+
+
+def test_minhash_signatures():
+    texts = pd.Series(["a b c d e f", "a b c d e f", "", "u v w x y z"])
+    signatures, has_signature = minhash_signatures(texts)
+
+    assert has_signature.tolist() == [True, True, False, True]
+    assert (signatures[0] == signatures[1]).all()
+    assert (signatures[0] == signatures[3]).mean() < 0.2
+
+
+@pytest.mark.parametrize("threshold", [0.5, 0.8, 0.95])
+def test_lsh_params(threshold):
+    bands, rows = _lsh_params(threshold, 64)
+    assert bands * rows <= 64
+    assert _lsh_recall(threshold, bands, rows) >= LSH_RECALL
+    # one more row per band misses more pairs at the threshold
+    assert _lsh_recall(threshold, 64 // (rows + 1), rows + 1) < LSH_RECALL
+
+
+def test_bucket_links():
+    codes = np.array([3, 7, 3, -1, 3, 7])
+    u, v = _bucket_links(codes)
+    assert sorted(zip(u.tolist(), v.tolist())) == [(2, 0), (4, 0), (4, 2), (5, 1)]
+
+    # with a window of one, every record is linked to the one before it
+    u, v = _bucket_links(codes, window=1)
+    assert sorted(zip(u.tolist(), v.tolist())) == [(2, 0), (4, 2), (5, 1)]
+
+
+def test_find_duplicates_similar_copies():
+    # the near duplicate is found among many copies of the first record
+    df = pd.concat(
+        [df_near_duplicates.iloc[[0]]] * 200 + [df_near_duplicates.iloc[[1, 2]]],
+        ignore_index=True,
+    )
+    df_clusters = find_duplicates(ASReviewData(df), pid=[], threshold=0.6)
+    assert df_clusters["record"].to_list() == list(range(201))
+    assert (df_clusters["cluster"] == 0).all()
+
+
+def test_connected_components():
+    labels = _connected_components(6, np.array([1, 4, 3]), np.array([3, 5, 0]))
+    assert labels.tolist() == [0, 0, 2, 0, 4, 4]
+
+
+def test_dedup(tmpdir):
+    input_path = Path(tmpdir, "input.csv")
+    df_near_duplicates.to_csv(input_path, index=False)
+    output_path = Path(tmpdir, "output.csv")
+    clusters_path = Path(tmpdir, "clusters.csv")
+
+    report_path = Path(tmpdir, "report.csv")
+
+    dedup(
+        input_path,
+        output_path,
+        threshold=0.6,
+        clusters_path=clusters_path,
+        report_path=report_path,
+    )
+
+    assert load_data(output_path).df["title"].to_list() == [
+        "Maintenance treatment",
+        "Other title",
+    ]
+    assert pd.read_csv(clusters_path)["record"].to_list() == [0, 1]
+    assert pd.read_csv(report_path)[["kept", "dropped"]].values.tolist() == [[0, 1]]
+
+
+def test_duplicate_report():
+    df_clusters = pd.DataFrame(
+        {
+            "record": [0, 3, 5, 1, 2],
+            "cluster": [0, 0, 0, 1, 1],
+            "score": [1.0, 1.0, 0.8, 1.0, 1.0],
+            "reason": ["doi", "doi", "similar text", "text", "text"],
+        }
+    )
+    df_report = duplicate_report(df_clusters)
+
+    assert df_report["kept"].to_list() == [0, 1]
+    assert df_report["dropped"].to_list() == ["3;5", "2"]
+    assert df_report["n_dropped"].to_list() == [2, 1]
+    assert df_report["reason"].to_list() == ["doi;similar text", "text"]
+    assert df_report["min_score"].to_list() == [0.8, 1.0]
+
+
+def test_merge_duplicates():
+    df = pd.DataFrame(
+        {
+            "title": ["A", "A", "B", "A"],
+            "abstract": ["Truncated", "", "Other", "Truncated abstract"],
+            "doi": ["10.1/a", "10.1/a", None, "10.1/a"],
+            "year": [2001, np.nan, 2003, 2004],
+        }
+    )
+    df_clusters = find_duplicates(ASReviewData(df.copy()))
+
+    df_merged = merge_duplicates(df, df_clusters)
+    assert df_merged["title"].to_list() == ["A", "B"]
+    assert df_merged["abstract"].to_list() == ["Truncated", "Other"]
+    assert df_merged["year"].to_list() == [2001, 2003]
+
+    df_merged = merge_duplicates(
+        df, df_clusters, {"abstract": "longest", "year": "last"}
+    )
+    assert df_merged["abstract"].to_list() == ["Truncated abstract", "Other"]
+    assert df_merged["year"].to_list() == [2004, 2003]
+
+    # missing fields are filled with the values of the duplicates
+    df.loc[0, "abstract"] = ""
+    df_merged = merge_duplicates(df, df_clusters)
+    assert df_merged["abstract"].to_list() == ["Truncated abstract", "Other"]
+
+    with pytest.raises(ValueError):
+        merge_duplicates(df, df_clusters, {"abstract": "shortest"})
+    with pytest.raises(ValueError, match="keywords"):
+        merge_duplicates(df, df_clusters, [("keywords", "longest")])
+    with pytest.raises(ValueError, match="year"):
+        merge_duplicates(df, df_clusters, {"year": "longest"})
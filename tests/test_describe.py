@@ -1,5 +1,211 @@
+import json
 import subprocess
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from asreview import ASReviewData
+from asreview import load_data
+from asreview.data.statistics import n_duplicates
+from asreview.data.statistics import n_irrelevant
+from asreview.data.statistics import n_missing_abstract
+from asreview.data.statistics import n_missing_title
+from asreview.data.statistics import n_records
+from asreview.data.statistics import n_relevant
+from asreview.data.statistics import n_unlabeled
+
+from asreviewcontrib.datatools.describe import DescribeStatistics
+from asreviewcontrib.datatools.describe import _HyperLogLog
+from asreviewcontrib.datatools.describe import _KeySet
+from asreviewcontrib.datatools.describe import describe
+from asreviewcontrib.datatools.describe import describe_files
+from asreviewcontrib.datatools.describe import describe_statistics
+from asreviewcontrib.datatools.io import iter_chunks
+
+parent_dir = Path(__file__).parent
+file_1 = Path(parent_dir, "demo_data", "dataset_1.ris")
+file_2 = Path(parent_dir, "demo_data", "dataset_2.ris")
+
+
+def _asreview_statistics(asdata):
+    return {
+        "n_records": n_records(asdata),
+        "n_relevant": n_relevant(asdata),
+        "n_irrelevant": n_irrelevant(asdata),
+        "n_unlabeled": n_unlabeled(asdata),
+        "n_missing_title": n_missing_title(asdata)[0],
+        "n_missing_abstract": n_missing_abstract(asdata)[0],
+        "n_duplicates": n_duplicates(asdata),
+    }
 
 
 def test_describe():
     subprocess.run(["asreview", "data-describe", "benchmark:van_de_schoot2017"])
+
+
+@pytest.mark.parametrize("input_path", [file_1, file_2])
+def test_describe_statistics(input_path):
+    # the counts are the same as the statistics of ASReview
+    asdata = load_data(input_path)
+    stats = {item["id"]: item["value"] for item in describe_statistics(asdata)}
+    for key, value in _asreview_statistics(asdata).items():
+        assert stats[key] == value
+
+
+def test_describe_statistics_extended():
+    asdata = ASReviewData(
+        df=pd.DataFrame(
+            {
+                "title": ["A", "B", "A", ""],
+                "abstract": ["abc", "", "abc", "abcde"],
+                "doi": ["10.1/a", None, "https://doi.org/10.1/B", "10.1/b"],
+                "year": ["2019", "2020/01/01", None, "2019"],
+                "included": [1, 0, -1, -1],
+            }
+        )
+    )
+    stats = {item["id"]: item["value"] for item in describe_statistics(asdata)}
+
+    assert stats["n_duplicates"] == 2
+    assert stats["null_rate"] == {
+        "title": 0.25,
+        "abstract": 0.25,
+        "doi": 0.25,
+        "year": 0.25,
+        "included": 0.5,
+    }
+    assert stats["year_histogram"] == {"2019": 2, "2020": 1}
+    assert stats["title_length"]["p50"] == 1
+    assert stats["abstract_length"]["mean"] == 3.7
+    assert stats["pid_coverage"] == {"doi": 0.75}
+
+    stats_pids = describe_statistics(asdata, pid=["doi", "pmid"])
+    assert stats_pids[-1]["value"] == {"doi": 0.75, "pmid": 0.0}
+
+
+@pytest.mark.parametrize("input_path", [file_1, file_2])
+@pytest.mark.parametrize("chunk_size", [1, 3, 100])
+def test_describe_statistics_chunks(input_path, chunk_size):
+    # the statistics of the chunks are the same as of the whole dataset
+    stats = DescribeStatistics()
+    for df in iter_chunks(input_path, chunk_size):
+        stats.update(ASReviewData(df=df))
+    assert stats.items() == describe_statistics(load_data(input_path))
+
+
+def test_describe_statistics_chunks_csv(tmpdir):
+    input_path = Path(tmpdir, "dataset.csv")
+    pd.DataFrame(
+        {
+            "title": ["A", "B", "A", "", "C"],
+            "doi": ["10.1/a", None, None, "10.1/B", "https://doi.org/10.1/b"],
+            "year": [2019, None, 2020, 2019, 2021],
+            "included": [1, 0, None, None, 1],
+        }
+    ).to_csv(input_path, index=False)
+
+    stats = DescribeStatistics()
+    for df in iter_chunks(input_path, 2):
+        stats.update(ASReviewData(df=df))
+    items = {item["id"]: item["value"] for item in stats.items()}
+    expected = {
+        item["id"]: item["value"] for item in describe_statistics(load_data(input_path))
+    }
+
+    assert items == expected
+    assert items["n_duplicates"] == 2
+    assert items["year_histogram"] == {"2019": 2, "2020": 1, "2021": 1}
+
+
+def test_key_set():
+    rng = np.random.default_rng(535)
+    key_set = _KeySet()
+    seen = set()
+    for _ in range(200):
+        hashes = rng.integers(0, 5000, 100).astype(np.uint64)
+        expected = []
+        for value in hashes.tolist():
+            expected.append(value in seen)
+            seen.add(value)
+        assert key_set.add(hashes).tolist() == expected
+    # the hashes are kept in a few sorted arrays
+    assert sum(len(run) for run in key_set._runs) == len(seen)
+    assert len(key_set._runs) <= 2 * np.log2(len(seen))
+
+
+def test_hyperloglog():
+    sketch = _HyperLogLog()
+    for _ in range(2):
+        for i in range(0, 100_000, 10_000):
+            sketch.add(pd.util.hash_array(np.arange(i, i + 10_000)))
+    assert sketch.count() == pytest.approx(100_000, rel=0.03)
+
+
+def test_describe_statistics_approximate():
+    asdata = load_data(file_1)
+    df = pd.concat([asdata.df] * 3, ignore_index=True)
+    stats = describe_statistics(ASReviewData(df=df), pid=[], approximate=True)
+    assert stats[6]["value"] == 2 * len(asdata.df)
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+@pytest.mark.parametrize("approximate", [False, True])
+def test_describe_files(jobs, approximate):
+    file_items, total_items = describe_files(
+        [file_1, file_2, file_1], jobs=jobs, approximate=approximate
+    )
+    assert file_items[1] == describe_statistics(
+        load_data(file_2), approximate=approximate
+    )
+
+    # the totals are the statistics of the stacked datasets
+    df = pd.concat(
+        [load_data(item).df for item in [file_1, file_2, file_1]], ignore_index=True
+    )
+    assert total_items[:-1] == describe_statistics(
+        ASReviewData(df=df), approximate=approximate
+    )
+
+    # dataset_2 has 3 records of dataset_1, and the second dataset_1 all 6
+    assert total_items[-1]["id"] == "n_cross_file_duplicates"
+    assert total_items[-1]["value"] == 9
+
+
+def test_describe_glob(tmpdir):
+    for item in [file_1, file_2]:
+        Path(tmpdir, item.name).write_bytes(item.read_bytes())
+    output_path = Path(tmpdir, "output.json")
+    describe(str(Path(tmpdir, "*.ris")), output_path=output_path)
+
+    with open(output_path) as f:
+        data = json.load(f)["data"]
+    assert [Path(item["path"]).name for item in data["files"]] == [
+        "dataset_1.ris",
+        "dataset_2.ris",
+    ]
+    assert data["items"][0]["value"] == 14
+
+    with pytest.raises(ValueError):
+        describe(str(Path(tmpdir, "*.csv")))
+
+
+def test_describe_statistics_random():
+    # many duplicate titles and DOIs, and all labels
+    n_records = 10_000
+    rng = np.random.default_rng(535)
+    asdata = ASReviewData(
+        df=pd.DataFrame(
+            {
+                "title": [f"Title {i}" for i in rng.integers(0, n_records, n_records)],
+                "abstract": [f"Abstract {i}" for i in range(n_records)],
+                "doi": [f"10.1/{i}" for i in rng.integers(0, n_records, n_records)],
+                "year": rng.integers(1990, 2024, n_records),
+                "included": rng.choice([-1, 0, 1], size=n_records),
+            }
+        )
+    )
+
+    stats = {item["id"]: item["value"] for item in describe_statistics(asdata)}
+    for key, value in _asreview_statistics(asdata).items():
+        assert stats[key] == value
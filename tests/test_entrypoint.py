@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SUBCOMMAND_MODULES = [
+    "asreviewcontrib.datatools.compose",
+    "asreviewcontrib.datatools.convert",
+    "asreviewcontrib.datatools.dedup",
+    "asreviewcontrib.datatools.describe",
+    "asreviewcontrib.datatools.pipeline",
+    "asreviewcontrib.datatools.snowball",
+    "asreviewcontrib.datatools.stack",
+]
+
+
+def _run_python(code):
+    # run the code in a new interpreter, which can import the package from the
+    # repository as well
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(Path(__file__).parent.parent), env.get("PYTHONPATH", "")]
+    )
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_entrypoint_lazy_imports():
+    # importing the entry point does not import the subcommands
+    result = _run_python(
+        "import sys\n"
+        "import asreviewcontrib.datatools.entrypoint\n"
+        "print(' '.join(sys.modules))"
+    )
+    assert not set(result.stdout.split()) & set(SUBCOMMAND_MODULES)
+
+
+@pytest.mark.benchmark
+def test_entrypoint_import_benchmark():
+    def import_time(modules):
+        # ASReview is imported by the asreview command before the entry point is
+        # loaded, so it is left out of the measured time
+        result = _run_python(
+            "import time\n"
+            "import asreview.entry_points\n"
+            "start = time.perf_counter()\n"
+            + "".join(f"import {module}\n" for module in modules)
+            + "print(time.perf_counter() - start)"
+        )
+        return float(result.stdout)
+
+    duration = min(
+        import_time(["asreviewcontrib.datatools.entrypoint"]) for _ in range(3)
+    )
+
+    # the reference imports all subcommands, like the entry point did before
+    reference_duration = min(
+        import_time(["asreviewcontrib.datatools.entrypoint", *SUBCOMMAND_MODULES])
+        for _ in range(3)
+    )
+    print(
+        f"Importing the entry point: {duration * 1000:.1f}ms,"
+        f" {reference_duration * 1000:.1f}ms with all subcommands"
+    )
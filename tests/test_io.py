@@ -0,0 +1,155 @@
+import importlib.util
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from asreview.data import ASReviewData
+from asreview.io import RISWriter
+
+from asreviewcontrib.datatools.io import ChunkedWriter
+from asreviewcontrib.datatools.io import iter_chunks
+from asreviewcontrib.datatools.io import load_datasets
+from asreviewcontrib.datatools.io import read_columns
+from asreviewcontrib.datatools.io import read_data
+from asreviewcontrib.datatools.io import write_data
+
+requires_pyarrow = pytest.mark.skipif(
+    importlib.util.find_spec("pyarrow") is None, reason="pyarrow is not installed"
+)
+
+df = pd.DataFrame(
+    {
+        "title": ["Title 1", "Title 2", "Title 3"],
+        "abstract": ["Abstract 1", "Abstract 2", "Abstract 3"],
+        "doi": ["10.1/1", None, "10.1/3"],
+    }
+)
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".tsv", ".ris", ".xlsx"])
+def test_chunked_writer(tmpdir, suffix):
+    output_path = Path(tmpdir, f"chunked{suffix}")
+    with ChunkedWriter(output_path) as writer:
+        writer.write(df.iloc[:2])
+        writer.write(df.iloc[2:2])
+        writer.write(df.iloc[2:])
+    assert writer.n_records == 3
+
+    expected_path = Path(tmpdir, f"expected{suffix}")
+    ASReviewData(df).to_file(expected_path)
+    pd.testing.assert_frame_equal(
+        ASReviewData.from_file(output_path).df,
+        ASReviewData.from_file(expected_path).df,
+    )
+
+
+def test_chunked_writer_csv(tmpdir):
+    output_path = Path(tmpdir, "chunked.csv")
+    with ChunkedWriter(output_path) as writer:
+        writer.write(df.iloc[:2])
+        writer.write(df.iloc[2:])
+
+    expected_path = Path(tmpdir, "expected.csv")
+    ASReviewData(df).to_file(expected_path)
+    assert output_path.read_text() == expected_path.read_text()
+
+
+def test_chunked_writer_ris(tmpdir):
+    # the records are numbered over all chunks and their tags are in the same
+    # order, also if the chunks have different columns
+    chunks = [
+        df.iloc[:2][["abstract", "title"]],
+        df.iloc[2:2],
+        df.iloc[2:].assign(year="2020"),
+    ]
+    output_path = Path(tmpdir, "chunked.ris")
+    with ChunkedWriter(output_path) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+
+    expected = RISWriter.write_data(pd.concat(chunks), None)
+    assert output_path.read_text() == expected
+    assert "\n3.\nTY  - JOUR\nAB  - Abstract 3\nTI  - Title 3\n" in expected
+
+
+def test_chunked_writer_memory():
+    with ChunkedWriter(None) as writer:
+        writer.write(df.iloc[:2])
+        writer.write(df.iloc[2:])
+    pd.testing.assert_frame_equal(writer.df, df.set_axis(range(3)))
+
+
+@pytest.mark.parametrize(
+    "suffix",
+    [
+        ".csv",
+        ".tsv",
+        ".ris",
+        pytest.param(".parquet", marks=requires_pyarrow),
+        pytest.param(".feather", marks=requires_pyarrow),
+    ],
+)
+def test_iter_chunks(tmpdir, suffix):
+    input_path = Path(tmpdir, f"input{suffix}")
+    write_data(ASReviewData(df), input_path)
+
+    chunks = list(iter_chunks(input_path, 2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert pd.concat(chunks)["title"].to_list() == df["title"].to_list()
+
+
+@requires_pyarrow
+def test_iter_chunks_feather_batches(tmpdir):
+    # the record batches of the file are read one by one and split into chunks
+    input_path = Path(tmpdir, "input.feather")
+    df_large = pd.concat([df] * 4, ignore_index=True)
+    df_large.to_feather(input_path, chunksize=5)
+
+    chunks = list(iter_chunks(input_path, 3))
+    assert [len(chunk) for chunk in chunks] == [3, 2, 3, 2, 2]
+    assert pd.concat(chunks)["title"].to_list() == df_large["title"].to_list()
+
+
+def test_read_columns(tmpdir):
+    input_path = Path(tmpdir, "input.csv")
+    df.rename(columns={"doi": " doi "}).to_csv(input_path, index=False)
+    assert read_columns(input_path) == ["title", "abstract", "doi"]
+
+
+@requires_pyarrow
+@pytest.mark.parametrize("suffix", [".parquet", ".feather", ".arrow"])
+def test_read_write_columnar(tmpdir, suffix):
+    as_ris = read_data(Path(Path(__file__).parent, "demo_data", "dataset_1.ris"))
+    output_path = Path(tmpdir, f"output{suffix}")
+    write_data(as_ris, output_path)
+
+    as_columnar = read_data(output_path)
+    pd.testing.assert_frame_equal(as_columnar.df, as_ris.df, check_dtype=False)
+    assert read_columns(output_path) == list(as_ris.df.columns)
+
+    # only the requested columns are read, and always a title or abstract column
+    as_projected = read_data(output_path, columns=["doi", "included"])
+    assert list(as_projected.df.columns) == ["title", "doi", "included"]
+    assert as_projected.labels.tolist() == as_ris.labels.tolist()
+
+
+@requires_pyarrow
+def test_write_columnar_mixed_types(tmpdir):
+    # numbers and text in one column are written as text
+    output_path = Path(tmpdir, "output.parquet")
+    write_data(ASReviewData(df.assign(year=[2020, "2021", None])), output_path)
+    assert pd.read_parquet(output_path)["year"].to_list() == ["2020", "2021", None]
+
+
+def test_load_datasets():
+    input_files = [
+        Path(Path(__file__).parent, "demo_data", "dataset_1.ris"),
+        None,
+        Path(Path(__file__).parent, "demo_data", "dataset_2.ris"),
+    ]
+    serial = load_datasets(input_files)
+    parallel = load_datasets(input_files, jobs=2)
+
+    assert parallel[1] is None
+    for as_serial, as_parallel in zip(serial[::2], parallel[::2]):
+        pd.testing.assert_frame_equal(as_serial.df, as_parallel.df)
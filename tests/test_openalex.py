@@ -0,0 +1,148 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+from urllib.parse import parse_qs
+from urllib.parse import urlsplit
+
+import pyalex
+import pytest
+import requests
+
+from asreviewcontrib.datatools.openalex import OpenAlexClient
+from asreviewcontrib.datatools.openalex import _TokenBucket
+from asreviewcontrib.datatools.snowball import openalex_from_doi
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Responds with the next response in the list of the server."""
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        status, body = self.server.responses.pop(0)
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps(body).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = HTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.requests = []
+    server.responses = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _client(server, **kwargs):
+    return OpenAlexClient(
+        backoff_factor=0,
+        base_url=f"http://127.0.0.1:{server.server_port}",
+        **kwargs,
+    )
+
+
+def test_token_bucket():
+    bucket = _TokenBucket(20, capacity=1)
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.2
+
+    bucket.slow_down()
+    assert bucket.rate == 10
+    bucket.speed_up()
+    assert bucket.rate == 11
+
+
+def test_retry(stub_server):
+    stub_server.responses = [
+        (429, {}),
+        (503, {}),
+        (200, {"meta": {}, "results": [{"id": "W1"}]}),
+    ]
+    client = _client(stub_server)
+
+    assert client.get(pyalex.Works().filter(doi="10.1/a"), per_page=10) == [
+        {"id": "W1"}
+    ]
+    assert client.n_requests == 3
+    assert client.n_retries == 2
+    assert client.n_rate_limited == 1
+    assert client._bucket.rate < 10
+    assert all(path.startswith("/works?") for path in stub_server.requests)
+
+
+def test_retry_exhausted(stub_server):
+    stub_server.responses = [(503, {})] * 3
+    client = _client(stub_server, max_retries=2)
+
+    with pytest.raises(requests.HTTPError):
+        client.get(pyalex.Works(), per_page=10)
+    assert client.n_requests == 3
+
+
+def test_paginate(stub_server):
+    stub_server.responses = [
+        (200, {"meta": {"next_cursor": "abc"}, "results": [{"id": "W1"}]}),
+        (200, {"meta": {"next_cursor": "def"}, "results": [{"id": "W2"}]}),
+        (200, {"meta": {"next_cursor": None}, "results": []}),
+    ]
+    client = _client(stub_server)
+
+    pages = list(client.paginate(pyalex.Works().filter(cites="W3"), per_page=1))
+    assert pages == [[{"id": "W1"}], [{"id": "W2"}]]
+    cursors = [
+        parse_qs(urlsplit(path).query)["cursor"][0] for path in stub_server.requests
+    ]
+    assert cursors == ["*", "abc", "def"]
+
+
+def test_openalex_from_doi_stub(stub_server):
+    stub_server.responses = [
+        (429, {}),
+        (
+            200,
+            {
+                "meta": {},
+                "results": [{"id": "W1", "doi": "https://doi.org/10.1/a"}],
+            },
+        ),
+    ]
+    client = _client(stub_server)
+
+    assert openalex_from_doi(["https://doi.org/10.1/a", "10.1/b"], client=client) == {
+        "10.1/a": "W1",
+        "10.1/b": None,
+    }
+    assert client.n_retries == 1
+
+
+def test_openalex_from_doi_normalized(stub_server):
+    stub_server.responses = [
+        (
+            200,
+            {
+                "meta": {},
+                "results": [{"id": "W1", "doi": "https://doi.org/10.1/A"}],
+            },
+        ),
+    ]
+    client = _client(stub_server)
+
+    assert openalex_from_doi(
+        ["https://doi.org/10.1/A", "10.1/a.", "not_a_doi"], client=client
+    ) == {"10.1/a": "W1", "not_a_doi": None}
+    # The duplicate DOI and the string that is not a DOI are not requested.
+    assert len(stub_server.requests) == 1
+    assert parse_qs(urlsplit(stub_server.requests[0]).query)["filter"] == ["doi:10.1/a"]
@@ -0,0 +1,245 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from asreviewcontrib.datatools.cache import DEFAULT_CACHE_DIR
+from asreviewcontrib.datatools.cache import OpenAlexCache
+from asreviewcontrib.datatools.compose import compose
+from asreviewcontrib.datatools.compose import create_composition
+from asreviewcontrib.datatools.dedup import dedup
+from asreviewcontrib.datatools.describe import describe
+from asreviewcontrib.datatools.io import read_data
+from asreviewcontrib.datatools.openalex import DEFAULT_RATE_LIMIT
+from asreviewcontrib.datatools.openalex import OpenAlexClient
+from asreviewcontrib.datatools.pipeline import _step_snowball
+from asreviewcontrib.datatools.pipeline import pipeline
+from asreviewcontrib.datatools.pipeline import run_pipeline
+from asreviewcontrib.datatools.snowball import OUTPUT_FIELDS
+from asreviewcontrib.datatools.stack import vstack
+
+parent_dir = Path(__file__).parent
+file_1 = Path(parent_dir, "demo_data", "dataset_1.ris")
+file_2 = Path(parent_dir, "demo_data", "dataset_2.ris")
+
+
+def test_run_pipeline(tmpdir):
+    stats_path = Path(tmpdir, "statistics.json")
+    asdata = run_pipeline(
+        {
+            "input": str(file_2),
+            "steps": [
+                {"step": "vstack", "input_files": [str(file_2)]},
+                {"step": "dedup"},
+                {"step": "compose", "role": "unlabeled", "labeled": str(file_1)},
+                {"step": "describe", "output_path": str(stats_path)},
+            ],
+        }
+    )
+
+    # the same dataset as composing the files
+    df_composed = create_composition(None, None, file_1, file_2)
+    pd.testing.assert_frame_equal(asdata.df.reset_index(drop=True), df_composed)
+
+    with open(stats_path) as f:
+        items = json.load(f)["data"]["items"]
+    assert items[0]["value"] == len(df_composed)
+
+
+def test_pipeline_spec(tmpdir):
+    # the same output as running the tools one after another
+    output_path = Path(tmpdir, "output.csv")
+    spec_path = Path(tmpdir, "pipeline.yaml")
+    spec_path.write_text(
+        "input:\n"
+        f"  - {file_1}\n"
+        f"  - {file_2}\n"
+        "steps:\n"
+        "  - step: dedup\n"
+        "    pid: doi\n"
+        f"output: {output_path}\n"
+    )
+    pytest.importorskip("yaml")
+    pipeline(spec_path)
+
+    vstack(Path(tmpdir, "stacked.ris"), [file_1, file_2])
+    dedup(Path(tmpdir, "stacked.ris"), Path(tmpdir, "dedup.csv"))
+    df_output = pd.read_csv(output_path)
+    df_dedup = pd.read_csv(Path(tmpdir, "dedup.csv"))
+    assert df_output["title"].to_list() == df_dedup["title"].to_list()
+    assert df_output["included"].to_list() == df_dedup["included"].to_list()
+
+    # the output in the spec is replaced by the given output
+    spec_path = Path(tmpdir, "pipeline.json")
+    spec_path.write_text(json.dumps({"input": str(file_1)}))
+    pipeline(spec_path, output_path=Path(tmpdir, "output.ris"))
+    assert len(read_data(Path(tmpdir, "output.ris")).df) == 6
+
+
+def _cache_snowball_responses(tmpdir):
+    # all responses are in the cache, so no requests are sent to OpenAlex
+    input_path = Path(tmpdir, "input.csv")
+    pd.DataFrame(
+        {"title": ["a", "b"], "openalex_id": ["https://openalex.org/W1", None]}
+    ).to_csv(input_path, index=False)
+    with OpenAlexCache(tmpdir) as cache:
+        cache.set_many("cites", {"https://openalex.org/W1": ["W2", "W3"]})
+        cache.set_many(
+            "work",
+            {
+                openalex_id: {**dict.fromkeys(OUTPUT_FIELDS), "id": openalex_id}
+                for openalex_id in ["W2", "W3"]
+            },
+        )
+    return input_path
+
+
+def test_pipeline_snowball(tmpdir):
+    input_path = _cache_snowball_responses(tmpdir)
+    asdata = run_pipeline(
+        {
+            "input": str(input_path),
+            "steps": [
+                {
+                    "step": "snowball",
+                    "forward": True,
+                    "use_all": True,
+                    "cache_dir": str(tmpdir),
+                },
+            ],
+        }
+    )
+    assert asdata.df["openalex_id"].to_list() == ["W2", "W3"]
+    assert not list(Path(tmpdir).glob("*.checkpoint.jsonl"))
+
+
+def test_pipeline_snowball_rate_limit(tmpdir, monkeypatch):
+    # the snowball step sends at most as many requests per second as the command
+    rates = []
+
+    class RecordingClient(OpenAlexClient):
+        def __init__(self, requests_per_second=DEFAULT_RATE_LIMIT, **kwargs):
+            rates.append(requests_per_second)
+            super().__init__(requests_per_second, **kwargs)
+
+    monkeypatch.setattr(
+        "asreviewcontrib.datatools.snowball.OpenAlexClient", RecordingClient
+    )
+    input_path = _cache_snowball_responses(tmpdir)
+    _step_snowball(
+        read_data(input_path), forward=True, use_all=True, cache_dir=str(tmpdir)
+    )
+    assert rates == [DEFAULT_RATE_LIMIT]
+
+
+def test_pipeline_snowball_options(tmpdir, monkeypatch):
+    # the rate limit and cache directory of the spec are passed to snowball
+    calls = []
+
+    def record_snowball(*args, **kwargs):
+        calls.append(kwargs)
+        return pd.DataFrame({"title": ["A"]})
+
+    monkeypatch.setattr("asreviewcontrib.datatools.pipeline.snowball", record_snowball)
+    steps = [
+        {"step": "snowball", "forward": True},
+        {"step": "snowball", "forward": True, "rate_limit": 2, "cache_dir": None},
+    ]
+    run_pipeline({"input": str(file_1), "steps": steps})
+    assert [(c["rate_limit"], c["cache_dir"]) for c in calls] == [
+        (DEFAULT_RATE_LIMIT, DEFAULT_CACHE_DIR),
+        (2, None),
+    ]
+
+
+def test_pipeline_compose_snowball(tmpdir):
+    # the records found by snowballing the composed dataset have no labels
+    input_path = _cache_snowball_responses(tmpdir)
+    output_path = Path(tmpdir, "output.csv")
+    run_pipeline(
+        {
+            "steps": [
+                {"step": "compose", "relevant": str(input_path)},
+                {
+                    "step": "snowball",
+                    "forward": True,
+                    "use_all": True,
+                    "cache_dir": str(tmpdir),
+                },
+            ],
+            "output": str(output_path),
+        }
+    )
+    assert pd.read_csv(output_path)["openalex_id"].to_list() == ["W2", "W3"]
+
+
+def test_pipeline_errors():
+    with pytest.raises(ValueError):
+        run_pipeline({"input": str(file_1), "steps": [{"step": "convert"}]})
+    with pytest.raises(ValueError):
+        run_pipeline({"steps": [{"step": "dedup"}]})
+    with pytest.raises(ValueError):
+        run_pipeline(
+            {
+                "input": str(file_1),
+                "steps": [{"step": "compose", "unlabeled": str(file_2)}],
+            }
+        )
+
+
+def test_pipeline_same_as_tools(tmpdir):
+    n_records = 1000
+    rng = np.random.default_rng(535)
+    input_files = []
+    for i in range(2):
+        input_files.append(Path(tmpdir, f"search_{i}.csv"))
+        pd.DataFrame(
+            {
+                "title": [f"Title {j}" for j in rng.integers(0, n_records, n_records)],
+                "abstract": [f"Abstract {j}" for j in range(n_records)],
+                "doi": [f"10.1/{j}" for j in rng.integers(0, n_records, n_records)],
+            }
+        ).to_csv(input_files[-1], index=False)
+    path_rel = Path(tmpdir, "relevant.csv")
+    pd.DataFrame(
+        {
+            "title": [f"Title {j}" for j in range(100)],
+            "abstract": [f"Abstract {j}" for j in range(100)],
+        }
+    ).to_csv(path_rel, index=False)
+
+    run_pipeline(
+        {
+            "steps": [
+                {"step": "vstack", "input_files": [str(p) for p in input_files]},
+                {"step": "dedup"},
+                {"step": "compose", "relevant": str(path_rel)},
+                {"step": "describe", "output_path": str(Path(tmpdir, "stats.json"))},
+            ],
+            "output": str(Path(tmpdir, "output.csv")),
+        }
+    )
+
+    # the reference runs the tools one after another, with intermediate files
+    vstack(Path(tmpdir, "stacked.csv"), input_files)
+    dedup(Path(tmpdir, "stacked.csv"), Path(tmpdir, "dedup.csv"))
+    compose(Path(tmpdir, "composed.csv"), path_rel, None, None, tmpdir / "dedup.csv")
+    describe(str(Path(tmpdir, "composed.csv")), Path(tmpdir, "ref_stats.json"))
+
+    # the intermediate files add columns with their record numbers
+    columns = ["title", "abstract", "doi", "included"]
+    pd.testing.assert_frame_equal(
+        pd.read_csv(Path(tmpdir, "output.csv"))[columns],
+        pd.read_csv(Path(tmpdir, "composed.csv"))[columns],
+    )
+
+    def read_counts(path):
+        with open(path) as f:
+            items = json.load(f)["data"]["items"]
+        return {item["id"]: item["value"] for item in items if item["id"][:2] == "n_"}
+
+    assert read_counts(Path(tmpdir, "stats.json")) == read_counts(
+        Path(tmpdir, "ref_stats.json")
+    )
@@ -1,9 +1,23 @@
+import random
+import sqlite3
+import timeit
 from pathlib import Path
 
 import pandas as pd
+import pyalex
+import pytest
 
+from asreviewcontrib.datatools.cache import OpenAlexCache
+from asreviewcontrib.datatools.openalex import OpenAlexClient
+from asreviewcontrib.datatools.snowball import OUTPUT_FIELDS
+from asreviewcontrib.datatools.snowball import _check_date_arg
+from asreviewcontrib.datatools.snowball import _Checkpoint
+from asreviewcontrib.datatools.snowball import _CitationGraph
+from asreviewcontrib.datatools.snowball import _keep_work
 from asreviewcontrib.datatools.snowball import backward_snowballing
 from asreviewcontrib.datatools.snowball import forward_snowballing
+from asreviewcontrib.datatools.snowball import invert_abstract
+from asreviewcontrib.datatools.snowball import normalize_doi
 from asreviewcontrib.datatools.snowball import openalex_from_doi
 from asreviewcontrib.datatools.snowball import snowball
 
@@ -56,6 +70,225 @@ def test_forward_snowballing():
     ]
 
 
+def test_forward_snowballing_workers():
+    identifiers = [
+        "https://openalex.org/W4281483266",
+        "https://openalex.org/W2008620264",
+    ]
+
+    assert forward_snowballing(identifiers) == forward_snowballing(
+        identifiers, workers=2, client=OpenAlexClient(requests_per_second=5)
+    )
+
+
+def _cached_work(openalex_id):
+    work = {field: None for field in OUTPUT_FIELDS}
+    work["id"] = openalex_id
+    return work
+
+
+def test_snowballing_from_cache(tmpdir):
+    # All responses are in the cache, so no requests are sent to OpenAlex.
+    with OpenAlexCache(tmpdir) as cache:
+        cache.set_many(
+            "doi", {"10.1042/cs20220150": "https://openalex.org/W4386305682"}
+        )
+        cache.set_many("cites", {"https://openalex.org/W4281483266": ["W1", "W2"]})
+        cache.set_many("references", {"https://openalex.org/W4281483266": ["W2"]})
+        cache.set_many("work", {"W1": _cached_work("W1"), "W2": _cached_work("W2")})
+
+        assert openalex_from_doi(
+            ["https://doi.org/10.1042/cs20220150"], cache=cache
+        ) == {"10.1042/cs20220150": "https://openalex.org/W4386305682"}
+        assert forward_snowballing(
+            ["https://openalex.org/W4281483266"], cache=cache
+        ) == {
+            "https://openalex.org/W4281483266": [_cached_work("W1"), _cached_work("W2")]
+        }
+        assert backward_snowballing(
+            ["https://openalex.org/W4281483266"], cache=cache
+        ) == {"https://openalex.org/W4281483266": [_cached_work("W2")]}
+
+
+@pytest.mark.parametrize(
+    "doi,expected",
+    [
+        ("10.1042/cs20220150", "10.1042/cs20220150"),
+        ("https://doi.org/10.1042/CS20220150", "10.1042/cs20220150"),
+        ("http://dx.doi.org/10.1042/cs20220150", "10.1042/cs20220150"),
+        (" doi: 10.1042/cs20220150.", "10.1042/cs20220150"),
+        ("not_a_doi", None),
+        (None, None),
+    ],
+)
+def test_normalize_doi(doi, expected):
+    assert normalize_doi(doi) == expected
+
+
+def test_snowballing_missing_ids_from_cache(tmpdir):
+    # Only the record without an OpenAlex identifier is looked up by its DOI.
+    pd.DataFrame(
+        {
+            "title": ["a", "b", "c"],
+            "doi": [None, "https://doi.org/10.1042/CS20220150", "not_a_doi"],
+            "openalex_id": ["https://openalex.org/W4281483266", None, None],
+        }
+    ).to_csv(Path(tmpdir, "input.csv"), index=False)
+    with OpenAlexCache(tmpdir) as cache:
+        cache.set_many(
+            "doi", {"10.1042/cs20220150": "https://openalex.org/W4386305682"}
+        )
+        cache.set_many(
+            "cites",
+            {
+                "https://openalex.org/W4281483266": ["W1"],
+                "https://openalex.org/W4386305682": ["W2"],
+            },
+        )
+        cache.set_many("work", {"W1": _cached_work("W1"), "W2": _cached_work("W2")})
+
+    snowball(
+        input_path=Path(tmpdir, "input.csv"),
+        output_path=Path(tmpdir, "output.csv"),
+        forward=True,
+        backward=False,
+        use_all=True,
+        cache_dir=tmpdir,
+    )
+    assert pd.read_csv(Path(tmpdir, "output.csv"))["openalex_id"].to_list() == [
+        "W1",
+        "W2",
+    ]
+
+
+def test_checkpoint(tmpdir):
+    checkpoint_path = Path(tmpdir, "output.csv.checkpoint.jsonl")
+    checkpoint = _Checkpoint(checkpoint_path)
+    checkpoint.add("forward", ["W1", "W2"], {"W1": [_cached_work("W3")], "W2": []})
+    checkpoint.add(
+        "backward",
+        ["W1", "W2"],
+        {"W1": [_cached_work("W3")], "W2": [_cached_work("W3")]},
+    )
+    checkpoint.close()
+
+    # A work found for several records is stored once, the checkpoint only contains
+    # its identifier.
+    works_path = Path(tmpdir, "output.csv.checkpoint.works.sqlite")
+    with sqlite3.connect(works_path) as conn:
+        assert conn.execute("SELECT id FROM works").fetchall() == [("W3",)]
+    conn.close()
+
+    # Simulate a run that was interrupted while writing a checkpoint.
+    with open(checkpoint_path, "a") as f:
+        f.write('{"direction": "forward", "identifiers": ["W5"')
+
+    checkpoint = _Checkpoint(checkpoint_path, resume=True)
+    assert checkpoint.identifiers == {"forward": {"W1", "W2"}, "backward": {"W1", "W2"}}
+    assert checkpoint.work_ids["forward"] == {"W1": ["W3"], "W2": []}
+    checkpoint.add("forward", ["W6"], {"W6": [_cached_work("W7")]})
+    checkpoint.close()
+
+    # Interrupt the resumed run as well, the chunks written after the first resume
+    # are kept.
+    with open(checkpoint_path, "a") as f:
+        f.write('{"direction": "backward", "identifiers": ["W8"')
+
+    checkpoint = _Checkpoint(checkpoint_path, resume=True)
+    assert checkpoint.identifiers == {
+        "forward": {"W1", "W2", "W6"},
+        "backward": {"W1", "W2"},
+    }
+    assert list(checkpoint.done_results("forward", ["W6", "W1", "W9", "W2"], 2)) == [
+        {"W6": [_cached_work("W7")], "W1": [_cached_work("W3")]},
+        {"W2": []},
+    ]
+    assert list(checkpoint.done_results("backward", ["W2"], 2)) == [
+        {"W2": [_cached_work("W3")]}
+    ]
+    checkpoint.remove()
+    assert not checkpoint_path.exists()
+    assert not works_path.exists()
+
+
+def test_keep_work():
+    work = _cached_work("W1")
+    work.update(publication_date="2020-05-01", cited_by_count=10)
+
+    assert _keep_work(work, None, None)
+    assert _keep_work(work, "2020-05-01", 10)
+    assert not _keep_work(work, "2021-01-01", None)
+    assert not _keep_work(work, None, 11)
+    assert not _keep_work(_cached_work("W2"), "2000-01-01", None)
+
+
+def test_check_date_arg():
+    assert _check_date_arg("2020-05-01") == "2020-05-01"
+    with pytest.raises(ValueError):
+        _check_date_arg("May 2020")
+
+
+def test_citation_graph(tmpdir):
+    graph = _CitationGraph()
+    graph.add_results("forward", {"W1": [_cached_work("W2"), _cached_work("W3")]})
+    graph.add_results("backward", {"W2": [_cached_work("W1")]})
+
+    edges_path = Path(tmpdir, "output_edges.csv")
+    nodes_path = Path(tmpdir, "output_nodes.csv")
+    graph.to_files(edges_path, nodes_path)
+
+    nodes = pd.read_csv(nodes_path)
+    assert nodes.to_dict("list") == {
+        "node_id": [0, 1, 2],
+        "openalex_id": ["W2", "W1", "W3"],
+    }
+    # The citation from W2 to W1 is found in both directions, but written once.
+    edges = pd.read_csv(edges_path)
+    assert edges.to_dict("list") == {"source": [0, 2], "target": [1, 1]}
+
+
+def _random_inverted_index(n_words, vocabulary):
+    inv_index = {}
+    for position in range(n_words):
+        inv_index.setdefault(random.choice(vocabulary), []).append(position)
+    return inv_index
+
+
+def test_invert_abstract():
+    assert invert_abstract(None) is None
+    assert invert_abstract({}) == ""
+    assert invert_abstract({"world": [1], "hello": [0, 2]}) == "hello world hello"
+
+    # Gaps in the positions and words sharing a position.
+    for inv_index in [{"a": [0, 3], "b": [1]}, {"a": [0, 1], "b": [1]}]:
+        assert invert_abstract(inv_index) == pyalex.invert_abstract(inv_index)
+
+
+@pytest.mark.benchmark
+def test_invert_abstract_benchmark():
+    random.seed(535)
+    vocabulary = [f"word{i}" for i in range(2000)]
+    inv_indices = [_random_inverted_index(250, vocabulary) for _ in range(1000)]
+
+    assert [invert_abstract(inv_index) for inv_index in inv_indices] == [
+        pyalex.invert_abstract(inv_index) for inv_index in inv_indices
+    ]
+
+    timings = {}
+    for name, func in [
+        ("pyalex", pyalex.invert_abstract),
+        ("datatools", invert_abstract),
+    ]:
+        timings[name] = min(
+            timeit.repeat(
+                lambda func=func: [func(inv_index) for inv_index in inv_indices],
+                number=1,
+                repeat=5,
+            )
+        )
+    print(f"Reconstructing 1000 abstracts of 250 words: {timings}")
+
+
 def test_openalex_id_forward(tmpdir):
     out_fp = Path(tmpdir, "forward_all.csv")
     snowball(
@@ -115,3 +348,17 @@ def test_snowballing_from_doi(tmpdir):
     )
     df = pd.read_csv(out_fp)
     assert len(df) == 117
+
+
+def test_snowballing_depth(tmpdir):
+    out_fp = Path(tmpdir, "backward_depth_2.csv")
+    snowball(
+        input_path=INPUT_DIR / "snowballing_openalex.csv",
+        output_path=out_fp,
+        forward=False,
+        backward=True,
+        use_all=False,
+        depth=2,
+    )
+    df = pd.read_csv(out_fp)
+    assert len(df) > 31
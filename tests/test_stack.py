@@ -1,5 +1,7 @@
 from pathlib import Path
 
+import pandas as pd
+import pytest
 from asreview.data import ASReviewData
 
 from asreviewcontrib.datatools.stack import vstack
@@ -18,3 +20,55 @@ def test_stack(tmpdir):
     assert as_test.df["included"].value_counts()[-1] == 9
     assert as_test.df["included"].value_counts()[0] == 3
     assert as_test.df["included"].value_counts()[1] == 2
+
+
+def test_stack_chunked(tmpdir):
+    output_path = Path(tmpdir, "test_output.ris")
+    vstack(output_path, [file_1, file_2], chunk_size=3)
+    as_test = ASReviewData.from_file(output_path)
+
+    expected_path = Path(tmpdir, "expected.ris")
+    vstack(expected_path, [file_1, file_2])
+    as_expected = ASReviewData.from_file(expected_path)
+
+    pd.testing.assert_frame_equal(
+        as_test.df, as_expected.df[as_test.df.columns], check_like=True
+    )
+
+
+def test_stack_chunked_union_columns(tmpdir):
+    input_1 = Path(tmpdir, "input_1.csv")
+    input_2 = Path(tmpdir, "input_2.tsv")
+    pd.DataFrame({"title": ["a", "b"], "year": ["2001", "2002"]}).to_csv(
+        input_1, index=False
+    )
+    pd.DataFrame({"title": ["c"], "doi": ["10.1/c"]}).to_csv(
+        input_2, sep="\t", index=False
+    )
+
+    output_path = Path(tmpdir, "test_output.csv")
+    vstack(output_path, [input_1, input_2], chunk_size=1)
+    df = pd.read_csv(output_path, index_col=0, dtype=str)
+
+    assert list(df.columns) == ["title", "year", "doi"]
+    assert df["title"].to_list() == ["a", "b", "c"]
+    assert df["year"].to_list()[:2] == ["2001", "2002"]
+    assert df["doi"].to_list()[2] == "10.1/c"
+
+
+def test_stack_parquet(tmpdir):
+    pytest.importorskip("pyarrow")
+    input_1 = Path(tmpdir, "input_1.csv")
+    input_2 = Path(tmpdir, "input_2.parquet")
+    pd.DataFrame({"title": ["a", "b"], "year": ["2001", "2002"]}).to_csv(
+        input_1, index=False
+    )
+    pd.DataFrame({"title": ["c"], "doi": ["10.1/c"]}).to_parquet(input_2)
+
+    for chunk_size in [None, 1]:
+        output_path = Path(tmpdir, f"test_output_{chunk_size}.parquet")
+        vstack(output_path, [input_1, input_2], chunk_size=chunk_size)
+        df = pd.read_parquet(output_path)
+
+        assert df["title"].to_list() == ["a", "b", "c"]
+        assert df["doi"].to_list()[2] == "10.1/c"